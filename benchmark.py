@@ -0,0 +1,426 @@
+# -*- coding: utf-8 -*-
+"""
+tkcalendar - Calendar and DateEntry widgets for Tkinter
+Copyright 2017-2018 Juliette Monsel <j_4321@protonmail.com>
+
+tkcalendar is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+tkcalendar is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmarks
+
+A display is needed, use Xvfb on a headless machine:
+
+    xvfb-run -a python benchmark.py -o results.json
+    xvfb-run -a python benchmark.py --compare results.json
+
+Each benchmark is repeated several times and the best and median times
+per operation are reported, in microseconds. Pending Tk events are
+processed inside the timed loop so that deferred redraws are accounted
+for.
+"""
+
+
+from __future__ import print_function
+
+import argparse
+import fnmatch
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from os.path import abspath, dirname
+try:
+    import Tkinter as tk
+    import ttk
+except ImportError:
+    import tkinter as tk
+    from tkinter import ttk
+
+import tkcalendar
+from tkcalendar import Calendar, CalendarModel, DateEntry
+
+try:
+    timer = time.perf_counter
+except AttributeError:
+    timer = time.time
+
+
+BENCHMARKS = []
+
+
+def benchmark(name, number):
+    """Register the decorated setup function as benchmark ``name``.
+
+    The setup function is called with the root window and returns the
+    function to time, which is called ``number`` times per repetition.
+    """
+    def decorator(setup):
+        BENCHMARKS.append((name, number, setup))
+        return setup
+    return decorator
+
+
+class Event:
+    """Fake click event."""
+    def __init__(self, widget, x=0, y=0):
+        self.widget = widget
+        self.x = x
+        self.y = y
+
+
+def _calendar(root, **kw):
+    cal = Calendar(root, year=2018, month=12, day=5, **kw)
+    cal.pack()
+    root.update()
+    return cal
+
+
+# --- Calendar
+
+
+for engine in ('label', 'canvas'):
+
+    @benchmark('calendar.init[%s]' % engine, 20)
+    def bench_init(root, engine=engine):
+
+        def run():
+            cal = Calendar(root, engine=engine)
+            cal.pack()
+            root.update_idletasks()
+            cal.destroy()
+
+        return run
+
+    @benchmark('calendar.next_month[%s]' % engine, 200)
+    def bench_next_month(root, engine=engine):
+        cal = _calendar(root, engine=engine)
+
+        def run():
+            cal._next_month()
+            root.update_idletasks()
+
+        return run
+
+    @benchmark('calendar.prev_year[%s]' % engine, 200)
+    def bench_prev_year(root, engine=engine):
+        cal = _calendar(root, engine=engine)
+
+        def run():
+            cal._prev_year()
+            root.update_idletasks()
+
+        return run
+
+    @benchmark('calendar.selection_set[%s]' % engine, 500)
+    def bench_selection_set(root, engine=engine):
+        cal = _calendar(root, engine=engine)
+        days = [date(2018, 12, 1) + timedelta(days=i) for i in range(28)]
+
+        def run(days=days):
+            cal.selection_set(days[0])
+            days.append(days.pop(0))
+            root.update_idletasks()
+
+        return run
+
+    @benchmark('calendar.on_click[%s]' % engine, 500)
+    def bench_on_click(root, engine=engine):
+        cal = _calendar(root, engine=engine, selectmode='day')
+        if engine == 'canvas':
+            canvas = cal._canvas
+            w = canvas.winfo_width()
+            h = canvas.winfo_height()
+            # clicks in the middle weeks so that the month does not change
+            events = [Event(canvas, int(w * (j + 1.5) / 8), int(h * (i + 2.5) / 7))
+                      for i in range(2, 4) for j in range(7)]
+            click = cal._on_canvas_click
+        else:
+            events = [Event(cal._calendar[i][j]) for i in range(2, 4) for j in range(7)]
+            click = cal._on_click
+
+        def run(events=events):
+            click(events[0])
+            events.append(events.pop(0))
+            root.update_idletasks()
+
+        return run
+
+    @benchmark('calendar.configure_colors[%s]' % engine, 50)
+    def bench_configure(root, engine=engine):
+        cal = _calendar(root, engine=engine)
+        colors = [dict(background='#1e1e1e', foreground='white', headersbackground='#333',
+                       weekendbackground='#2a2a2a', selectbackground='#1a5fb4'),
+                  dict(background='white', foreground='black', headersbackground='gray70',
+                       weekendbackground='gray80', selectbackground='#424242')]
+
+        def run(colors=colors):
+            cal.configure(**colors[0])
+            colors.reverse()
+            root.update_idletasks()
+
+        return run
+
+
+@benchmark('calendar.configure_colors_shared[20 calendars]', 10)
+def bench_configure_shared(root):
+    # the calendars share one style set and all change to the same colors
+    cals = [Calendar(root, year=2018, month=12, day=5) for i in range(20)]
+    for cal in cals:
+        cal.pack()
+    root.update()
+    colors = [dict(background='#1e1e1e', foreground='white', headersbackground='#333',
+                   weekendbackground='#2a2a2a', selectbackground='#1a5fb4'),
+              dict(background='white', foreground='black', headersbackground='gray70',
+                   weekendbackground='gray80', selectbackground='#424242')]
+
+    def run(colors=colors):
+        for cal in cals:
+            cal.configure(**colors[0])
+        colors.reverse()
+        root.update_idletasks()
+
+    return run
+
+
+@benchmark('calendar.theme_change', 10)
+def bench_theme_change(root):
+    for engine in ('label', 'canvas'):
+        for i in range(5):
+            _calendar(root, engine=engine)
+    style = ttk.Style(root)
+    themes = [t for t in ('clam', 'alt', 'default') if t in style.theme_names()]
+
+    def run(themes=themes):
+        style.theme_use(themes[0])
+        themes.append(themes.pop(0))
+        root.update()
+
+    return run
+
+
+for count in (10, 100, 500):
+
+    @benchmark('theme_change[%i widgets]' % count, 3)
+    def bench_theme_change_count(root, count=count):
+        # half calendars, half date entries; the whole update is timed, it
+        # is spread across several idle callbacks
+        for i in range(count // 2):
+            Calendar(root, engine=('label', 'canvas')[i % 2]).pack()
+            DateEntry(root).pack()
+        root.update()
+        style = ttk.Style(root)
+        themes = [t for t in ('clam', 'alt', 'default') if t in style.theme_names()]
+
+        def run(themes=themes):
+            style.theme_use(themes[0])
+            themes.append(themes.pop(0))
+            root.update()
+
+        return run
+
+
+# --- CalendarModel (no Tk call)
+
+
+@benchmark('model.get_view', 1000)
+def bench_model_view(root):
+    model = CalendarModel(2018, 12, selectmode='range')
+    model.sel_range = (date(2018, 12, 5), date(2018, 12, 20))
+    return model.get_view
+
+
+@benchmark('model.next_month', 1000)
+def bench_model_next_month(root):
+    model = CalendarModel(2018, 12, disableddays=lambda d: d.weekday() > 4)
+
+    def run():
+        model.next_month()
+        model.get_view()
+
+    return run
+
+
+# --- DateEntry
+
+
+@benchmark('dateentry.drop_down', 50)
+def bench_drop_down(root):
+    de = DateEntry(root, year=2018, month=12, day=5)
+    de.pack()
+    root.update()
+
+    def run():
+        de.drop_down()  # open
+        root.update()
+        de.drop_down()  # close
+        root.update()
+
+    return run
+
+
+@benchmark('dateentry.get_date', 5000)
+def bench_get_date(root):
+    de = DateEntry(root, year=2018, month=12, day=5)
+    de.pack()
+    root.update()
+    return de.get_date
+
+
+# --- date formatting and parsing
+
+
+DATES = [date(2000, 1, 1) + timedelta(days=i) for i in range(1000)]
+
+
+@benchmark('babel.format_date', 5)
+def bench_babel_format(root):
+    from babel.dates import format_date
+    return lambda: [format_date(d, 'short', 'en_US') for d in DATES]
+
+
+@benchmark('babel.parse_date', 5)
+def bench_babel_parse(root):
+    from babel.dates import format_date, parse_date
+    texts = [format_date(d, 'short', 'en_US') for d in DATES]
+    return lambda: [parse_date(t, 'en_US') for t in texts]
+
+
+@benchmark('tkcalendar.format_date', 5)
+def bench_format(root):
+    cal = _calendar(root, locale='en_US')
+    return lambda: [cal.format_date(d) for d in DATES]
+
+
+@benchmark('tkcalendar.format_dates', 5)
+def bench_format_dates(root):
+    tkcalendar.format_dates(DATES[:1], 'en_US')  # load the locale
+    return lambda: tkcalendar.format_dates(DATES, 'en_US')
+
+
+@benchmark('tkcalendar.parse_date', 5)
+def bench_parse(root):
+    cal = _calendar(root, locale='en_US')
+    bundle = cal._locale_bundle
+    texts = [cal.format_date(d) for d in DATES]
+
+    def run():
+        bundle._parsed_dates.cache_clear()
+        [cal.parse_date(t) for t in texts]
+
+    return run
+
+
+@benchmark('tkcalendar.parse_date_cached', 5)
+def bench_parse_cached(root):
+    cal = _calendar(root, locale='en_US')
+    texts = [cal.format_date(d) for d in DATES]
+    return lambda: [cal.parse_date(t) for t in texts]
+
+
+# --- runner
+
+
+def import_time():
+    """Return the time needed to import tkcalendar in a new interpreter, in µs."""
+    cmd = [sys.executable, '-c',
+           'import time, tkinter, tkinter.ttk, tkinter.font; t = time.perf_counter(); '
+           'import tkcalendar; print((time.perf_counter() - t) * 1e6)']
+    if sys.version_info < (3, 3):
+        return None
+    times = [float(subprocess.check_output(cmd, cwd=dirname(abspath(tkcalendar.__file__))))
+             for i in range(5)]
+    return min(times)
+
+
+def run_benchmark(root, setup, number, repeat):
+    """Return the time per call in µs of each repetition."""
+    frame = ttk.Frame(root)
+    frame.pack()
+    try:
+        func = setup(frame)
+        func()  # warm up
+        times = []
+        for i in range(repeat):
+            t0 = timer()
+            for j in range(number):
+                func()
+            times.append((timer() - t0) / number * 1e6)
+        return times
+    finally:
+        frame.destroy()
+        root.update()
+
+
+def git_revision():
+    try:
+        out = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                      cwd=dirname(abspath(__file__)),
+                                      stderr=subprocess.STDOUT)
+        return out.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, reference):
+    ref = reference['results']
+    print('\n%-36s %12s %12s %8s' % ('benchmark', 'before (µs)', 'after (µs)', 'ratio'))
+    for name, res in results['results'].items():
+        if name in ref:
+            before = ref[name]['best']
+            after = res['best']
+            print('%-36s %12.1f %12.1f %7.2fx' % (name, before, after, before / after))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark tkcalendar.')
+    parser.add_argument('-o', '--output', help='write the results to this JSON file')
+    parser.add_argument('-c', '--compare', help='compare with the results in this JSON file')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of repetitions')
+    parser.add_argument('-k', dest='pattern', default='*',
+                        help='only run the benchmarks matching this glob pattern')
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    root.geometry('+0+0')
+    results = {'revision': git_revision(),
+               'python': platform.python_version(),
+               'tk': str(root.tk.call('info', 'patchlevel')),
+               'results': {}}
+    for name, number, setup in BENCHMARKS:
+        if not fnmatch.fnmatch(name, args.pattern):
+            continue
+        times = sorted(run_benchmark(root, setup, number, args.repeat))
+        res = {'number': number, 'repeat': args.repeat,
+               'best': times[0], 'median': times[len(times) // 2]}
+        results['results'][name] = res
+        print('%-36s best %10.1f µs   median %10.1f µs' % (name, res['best'], res['median']))
+    root.destroy()
+
+    if fnmatch.fnmatch('import', args.pattern):
+        t = import_time()
+        if t is not None:
+            results['results']['import'] = {'number': 1, 'repeat': 5, 'best': t, 'median': t}
+            print('%-36s best %10.1f µs' % ('import', t))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -21,8 +21,14 @@ Test
 
 
 import unittest
-from tkcalendar import Calendar, DateEntry
-from datetime import date
+import os
+import sys
+import subprocess
+import time
+from tkcalendar import Calendar, DateEntry, CalendarModel
+import tkcalendar
+import calendar
+from datetime import date, datetime
 import babel.dates
 try:
     import Tkinter as tk
@@ -32,6 +38,10 @@ except ImportError:
     from tkinter import ttk
 from pynput.mouse import Controller, Button
 from locale import getdefaultlocale
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 def format_date(date, length):
@@ -60,6 +70,307 @@ class TestEvent:
             return self._prop[attr]
 
 
+class TestMonthGrid(unittest.TestCase):
+    def test_month_grid(self):
+        for firstweekday in range(7):
+            cal = calendar.Calendar(firstweekday)
+            for month in range(1, 13):
+                grid = tkcalendar._get_month_grid(2018, month, firstweekday)
+                self.assertEqual(len(grid), 6)
+                days = [cell[0] for week in grid for cell in week]
+                self.assertEqual(days, sorted(days))
+                self.assertEqual((days[-1] - days[0]).days, 41)
+                weeks = cal.monthdatescalendar(2018, month)
+                self.assertEqual(days[:7 * len(weeks)], [d for w in weeks for d in w])
+                for week in grid:
+                    for day, other_month, weekend in week:
+                        self.assertEqual(other_month, day.month != month)
+                        self.assertEqual(weekend, day.weekday() > 4)
+                self.assertEqual(list(grid.days), days)
+                for i, day in enumerate(days):
+                    self.assertEqual(grid.index[day], divmod(i, 7))
+
+    def test_selection_cell_year_boundary(self):
+        # january 2016 starts in the week 53 of 2015
+        grid = tkcalendar._get_month_grid(2016, 1, 0)
+        self.assertEqual(grid.index[date(2015, 12, 31)], (0, 3))
+        self.assertEqual(grid.index[date(2016, 1, 4)], (1, 0))
+        self.assertNotIn(date(2015, 12, 27), grid.index)
+        grid = tkcalendar._get_month_grid(2018, 12, 0)
+        self.assertEqual(grid.index[date(2019, 1, 1)], (5, 1))
+
+    def test_week_numbers(self):
+        for firstweekday in range(7):
+            for year in (2015, 2016, 2020, 2021):
+                for month in range(1, 13):
+                    grid = tkcalendar._get_month_grid(year, month, firstweekday)
+                    for i_week, week in enumerate(grid):
+                        # ISO week of the majority of the days of the row
+                        weeks = [cell[0].isocalendar()[1] for cell in week]
+                        expected = max(set(weeks), key=weeks.count)
+                        self.assertEqual(grid.week_numbers[i_week], str(expected))
+        self.assertEqual(tkcalendar._get_month_grid(2020, 12, 0).week_numbers,
+                         ('49', '50', '51', '52', '53', '1'))
+        self.assertEqual(tkcalendar._get_month_grid(2021, 1, 6).week_numbers,
+                         ('53', '1', '2', '3', '4', '5'))
+
+    def test_month_grid_cache(self):
+        tkcalendar._month_grid_cache.cache_clear()
+        grid = tkcalendar._get_month_grid(2018, 2, 0)
+        info = tkcalendar.month_grid_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 1, 1))
+        self.assertIs(tkcalendar._get_month_grid(2018, 2, 0), grid)
+        self.assertEqual(tkcalendar.month_grid_cache_info().hits, 1)
+        cache = tkcalendar._LRUCache(maxsize=2)
+        cache[1] = 1
+        cache[2] = 2
+        cache.get(1)
+        cache[3] = 3
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1), 1)
+
+
+class TestCalendarModel(unittest.TestCase):
+    def test_view(self):
+        model = CalendarModel(2018, 3, calendar.MONDAY)
+        view = model.get_view()
+        self.assertIs(view.grid, tkcalendar._get_month_grid(2018, 3, calendar.MONDAY))
+        self.assertEqual(view.week_numbers, ('9', '10', '11', '12', '13', '14'))
+        self.assertEqual(view.styles[0], ('normal_om',) * 3 + ('normal', 'normal', 'we', 'we'))
+        self.assertEqual(view.selection, set())
+        self.assertEqual(view.disabled, frozenset())
+        self.assertTrue(model.select(date(2018, 3, 14)))
+        view = model.get_view()
+        self.assertEqual(view.selection, set([(2, 2)]))
+        self.assertEqual(view.styles[2][2], 'sel')
+        model.tags['hol'] = {'background': 'red', 'foreground': 'white', 'style': 'tag1'}
+        model.calevents[0] = {'date': date(2018, 3, 15), 'text': '', 'tags': ['hol']}
+        model.calevent_dates[date(2018, 3, 15)] = [0]
+        self.assertEqual(model.get_view().styles[2][3], 'tag1')
+
+    def test_navigation(self):
+        model = CalendarModel(2018, 6, calendar.MONDAY, mindate=date(2018, 2, 10),
+                              maxdate=date(2018, 4, 20))
+        self.assertEqual(model.date, date(2018, 4, 1))
+        self.assertEqual(model.get_navigation_state(), (True, False))
+        self.assertFalse(model.next_month())
+        self.assertTrue(model.prev_year())
+        self.assertEqual(model.date, date(2018, 2, 1))
+        self.assertFalse(model.prev_month())
+        self.assertTrue(model.next_year())
+        self.assertEqual(model.date, date(2018, 4, 1))
+        self.assertFalse(model.see(date(2018, 4, 15)))
+        self.assertTrue(model.see(date(2018, 3, 15)))
+        self.assertEqual(model.date, date(2018, 3, 1))
+
+    def test_selection(self):
+        calls = []
+
+        def weekends(day):
+            calls.append(day)
+            return day.weekday() > 4
+
+        model = CalendarModel(2018, 3, calendar.MONDAY, 'range', disableddays=weekends)
+        self.assertFalse(model.select(date(2018, 3, 8)))
+        model.range_hover = date(2018, 3, 12)
+        self.assertEqual(model.get_view().selection,
+                         set([(1, 3), (1, 4), (2, 0)]))
+        self.assertEqual(len(calls), 42)
+        self.assertTrue(model.select(date(2018, 3, 12)))
+        self.assertEqual(model.sel_range, (date(2018, 3, 8), date(2018, 3, 12)))
+        self.assertEqual(model.get_key_target(days=1), date(2018, 3, 13))
+        self.assertEqual(model.get_key_target(days=-4), date(2018, 3, 8))
+        model.move_key(model.get_key_target(edge='end'))
+        self.assertEqual(model.key_date, date(2018, 3, 30))
+        self.assertEqual(model.get_view().selection, set([(4, 4)]))
+        # the grid results are cached, the moves of the cursor checked 4 days
+        self.assertEqual(len(calls), 42 + 4)
+        model.invalidate_disabled_days()
+        model.get_view()
+        self.assertEqual(len(calls), 2 * 42 + 4)
+
+        model = CalendarModel(2018, 3, calendar.MONDAY, 'multiple')
+        model.select(date(2018, 3, 1))
+        model.select(date(2018, 3, 2))
+        model.select(date(2018, 3, 1))
+        self.assertEqual(model.sel_dates, set([date(2018, 3, 2)]))
+        # the cursor moves from the last clicked day to 2 march and previews its unselection
+        model.move_key(model.get_key_target(days=1))
+        self.assertEqual(model.key_date, date(2018, 3, 2))
+        self.assertEqual(model.get_view().selection, set())
+
+        model = CalendarModel(2018, 3, calendar.MONDAY, 'none')
+        model.sel_date = date(2018, 3, 1)
+        self.assertEqual(model.get_view().selection, set())
+
+
+class TestLocale(unittest.TestCase):
+    def test_locale_bundle(self):
+        tkcalendar.preload_locales(['en_US', 'fr_FR'])
+        self.assertIn('fr_FR', tkcalendar._locale_bundles)
+        self.assertIs(tkcalendar._get_locale_bundle('fr_FR'),
+                      tkcalendar._locale_bundles['fr_FR'])
+        for locale in ['en_US', 'fr_FR', 'de_DE', 'ja_JP']:
+            bundle = tkcalendar._get_locale_bundle(locale)
+            self.assertEqual(bundle.day_names,
+                             babel.dates.get_day_names('abbreviated', locale=locale))
+            self.assertEqual(bundle.month_names,
+                             babel.dates.get_month_names('wide', locale=locale))
+            for day in [date(2018, 12, 31), date(2004, 4, 1)]:
+                txt = babel.dates.format_date(day, 'short', locale=locale)
+                self.assertEqual(bundle.format_date(day), txt)
+                self.assertEqual(bundle.parse_date(txt), babel.dates.parse_date(txt, locale))
+        with self.assertRaises(AssertionError):
+            bundle.format_date('2018-12-31')
+
+
+class TestDateParser(unittest.TestCase):
+    locales = ['en_US', 'en_GB', 'fr_FR', 'de_DE', 'es_ES', 'it_IT', 'nl_NL',
+               'pt_BR', 'ru_RU', 'pl_PL', 'sv_SE', 'fi_FI', 'hu_HU', 'cs_CZ',
+               'tr_TR', 'he_IL', 'ar_EG', 'fa_IR', 'hi_IN', 'th_TH', 'ja_JP',
+               'zh_CN', 'zh_TW', 'ko_KR', 'bg_BG', 'lt_LT', 'en_ZA', 'en_CA']
+    dates = [date(2018, 12, 31), date(2004, 4, 1), date(1999, 1, 2),
+             date(2030, 10, 11), date(2000, 2, 29)]
+    inputs = ['1/2/03', '12/31/2018', '31/12/2018', '2018-12-31', '20181231',
+              '31.12.18', '2018/12/31', '13/13/13', '5-6-7', '1.2.3.', ' 3/4/05 ',
+              '2/30/18', '12/31', 'abc']
+
+    def assertSameResult(self, bundle, txt):
+        try:
+            expected = babel.dates.parse_date(txt, bundle.locale)
+        except Exception as e:
+            with self.assertRaises(type(e)):
+                bundle._parse_date(txt)
+        else:
+            self.assertEqual(bundle._parse_date(txt), expected, (str(bundle.locale), txt))
+
+    def test_conformance(self):
+        for locale in self.locales:
+            bundle = tkcalendar._LocaleBundle(locale)
+            for day in self.dates:
+                txt = bundle.format_date(day)
+                self.assertSameResult(bundle, txt)
+                self.assertSameResult(bundle, txt + ' ')
+            for txt in self.inputs:
+                self.assertSameResult(bundle, txt)
+
+    def test_compiled_pattern(self):
+        self.assertIsNotNone(tkcalendar._get_locale_bundle('en_US')._date_regex)
+        pattern = babel.dates.parse_pattern('d MMM y')
+        self.assertIsNone(tkcalendar._compile_date_pattern(pattern))
+        pattern = babel.dates.parse_pattern('yyyyMMdd')
+        self.assertIsNone(tkcalendar._compile_date_pattern(pattern))
+        regex = tkcalendar._compile_date_pattern(babel.dates.parse_pattern('dd.MM.yy'))
+        self.assertEqual(regex.match('31.12.18').groups(), ('31', '12', '18'))
+
+    def test_compiled_formatter(self):
+        for locale in self.locales:
+            bundle = tkcalendar._LocaleBundle(locale)
+            for day in self.dates + [date(1, 2, 3), date(9999, 12, 31)]:
+                self.assertEqual(bundle.format_date(day),
+                                 babel.dates.format_date(day, 'short', locale=locale),
+                                 (locale, day))
+        self.assertIsNone(tkcalendar._compile_date_formatter(babel.dates.parse_pattern('d MMM y')))
+        formatter = tkcalendar._compile_date_formatter(babel.dates.parse_pattern("dd.MM.yyyy '%'"))
+        self.assertEqual(formatter(date(18, 1, 2)), '02.01.0018 %')
+
+    def test_bulk(self):
+        self.assertEqual(tkcalendar.format_dates(self.dates + [None], 'fr_FR'),
+                         [babel.dates.format_date(d, 'short', locale='fr_FR') for d in self.dates] + [None])
+        dates = [d for d in self.dates if d.year >= 2000]  # 2-digit years
+        texts = tkcalendar.format_dates(dates, 'en_US')
+        self.assertEqual(tkcalendar.parse_dates(texts + ['', None], 'en_US'),
+                         dates + [None, None])
+        with self.assertRaises(ValueError):
+            tkcalendar.parse_dates(['12/31/18', '2/30/18'], 'en_US')
+        # same as the per-call method of a widget with the default locale
+        bundle = tkcalendar._get_locale_bundle(tkcalendar._get_default_locale())
+        self.assertEqual(tkcalendar.format_dates(self.dates),
+                         [bundle.format_date(d) for d in self.dates])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_bulk_numpy(self):
+        dates = numpy.array(['2018-12-31', 'NaT', '2004-04-01T23:59'], dtype='datetime64[m]')
+        self.assertEqual(tkcalendar.format_dates(dates, 'en_US'), ['12/31/18', None, '4/1/04'])
+        dates = [numpy.datetime64('2018-12-31'), numpy.datetime64('NaT'), date(2004, 4, 1)]
+        self.assertEqual(tkcalendar.format_dates(dates, 'en_US'), ['12/31/18', None, '4/1/04'])
+        texts = numpy.array(['12/31/18', '4/1/04'])
+        self.assertEqual(tkcalendar.parse_dates(texts, 'en_US'), [date(2018, 12, 31), date(2004, 4, 1)])
+
+    def test_memo(self):
+        bundle = tkcalendar._LocaleBundle('en_US')
+        self.assertEqual(bundle.parse_date('12/31/18'), date(2018, 12, 31))
+        self.assertEqual(bundle.parse_date('12/31/18'), date(2018, 12, 31))
+        info = bundle._parsed_dates.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        with self.assertRaises(ValueError):
+            bundle.parse_date('2/30/18')
+        self.assertEqual(len(bundle._parsed_dates), 1)
+
+
+class TestImport(unittest.TestCase):
+    def run_python(self, *args):
+        cwd = os.path.dirname(os.path.abspath(tkcalendar.__file__))
+        proc = subprocess.Popen((sys.executable,) + args, cwd=cwd,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = proc.communicate()
+        self.assertEqual(proc.returncode, 0, err)
+        return out.decode(), err.decode()
+
+    def test_lazy_babel_import(self):
+        out, err = self.run_python('-c', 'import sys, tkcalendar; '
+                                   'print("babel" in sys.modules); '
+                                   'tkcalendar.preload_locales(["en_US"]); '
+                                   'print("babel" in sys.modules)')
+        self.assertEqual(out.split(), ['False', 'True'])
+
+    @unittest.skipIf(sys.version_info < (3, 7), "-X importtime requires Python 3.7+")
+    def test_import_time(self):
+        # tkinter is imported first so that only tkcalendar's own cost is measured
+        out, err = self.run_python('-X', 'importtime', '-c',
+                                   'import tkinter, tkinter.ttk, tkinter.font; '
+                                   'import tkcalendar')
+        cumulative = None
+        for line in err.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3:
+                self.assertNotEqual(fields[2].strip().split('.')[0], 'babel')
+                if fields[2].strip() == 'tkcalendar':
+                    cumulative = int(fields[1])
+        self.assertIsNotNone(cumulative)
+        self.assertLess(cumulative, 100000)  # microseconds
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_call_counter(self):
+        class Interp:
+            def call(self, *args):
+                return args
+
+            def getboolean(self, value):
+                return bool(value)
+
+        instrumentation = tkcalendar._Instrumentation()
+        proxy = tkcalendar._TkCallCounter(Interp(), instrumentation)
+        self.assertEqual(proxy.call('.cal.lbl', 'configure', '-text', '1'),
+                         ('.cal.lbl', 'configure', '-text', '1'))
+        proxy.call(('.cal.lbl', 'configure', '-text', '2'))
+        proxy.call('ttk::style', 'map', 'TLabel')
+        proxy.call('event', 'generate', '.cal', '<<CalendarSelected>>')
+        self.assertTrue(proxy.getboolean(1))
+        stats = instrumentation.get()
+        self.assertEqual(stats['calls'], {'configure': 2, 'ttk::style map': 1,
+                                          'event generate': 1})
+        self.assertEqual(stats['events'], {'<<CalendarSelected>>': 1})
+
+        func = instrumentation.wrap('func', lambda x: 2 * x)
+        self.assertEqual(func(2), 4)
+        self.assertEqual(instrumentation.get()['timings']['func']['count'], 1)
+        instrumentation.reset()
+        self.assertEqual(instrumentation.get(), {'calls': {}, 'events': {}, 'timings': {}})
+
+
 class TestCalendar(BaseWidgetTest):
     def test_calendar_init(self):
         widget = Calendar(self.window)
@@ -114,7 +425,7 @@ class TestCalendar(BaseWidgetTest):
             widget.destroy()
 
     def test_calendar_buttons_functions(self):
-        widget = Calendar(self.window)
+        widget = Calendar(self.window, firstweekday=calendar.MONDAY)
         widget.pack()
         widget._prev_month()
         widget._next_month()
@@ -129,23 +440,646 @@ class TestCalendar(BaseWidgetTest):
         self.assertIsNone(widget.selection_get())
         widget.selection_set(date(2015, 12, 31))
         self.assertEqual(widget.selection_get(), date(2015, 12, 31))
+        widget.configure(mindate=date(2015, 1, 1))
+        widget.selection_set(datetime(2015, 12, 30, 18, 30))
+        self.window.update()
+        self.assertEqual(type(widget.selection_get()), date)
+        self.assertEqual(widget.selection_get(), date(2015, 12, 30))
+        widget.configure(mindate=None)
+        widget.selection_set(date(2015, 12, 31))
 
         widget.config(selectmode='none')
         self.assertIsNone(widget.selection_get())
-        l = ttk.Label(widget, text="12")
-        widget._on_click(TestEvent(widget=l))
+        # the grid of december 2015 starts on monday 30 november
+        widget._on_click(TestEvent(widget=widget._calendar[1][5]))
         self.assertIsNone(widget.selection_get())
         self.window.update()
         widget.config(selectmode='day')
-        l = ttk.Label(widget, text="12")
-        widget._on_click(TestEvent(widget=l))
+        widget._on_click(TestEvent(widget=widget._calendar[1][5]))
         self.window.update()
         self.assertEqual(widget.selection_get(), date(2015, 12, 12))
+        widget._on_click(TestEvent(widget=ttk.Label(widget, text="14")))
+        self.assertEqual(widget.selection_get(), date(2015, 12, 12))
         widget.config(state='disabled')
-        l = ttk.Label(widget, text="14")
-        widget._on_click(TestEvent(widget=l))
+        widget._on_click(TestEvent(widget=widget._calendar[2][0]))
         self.window.update()
         self.assertEqual(widget.selection_get(), date(2015, 12, 12))
+        widget.config(state='normal')
+        # day of the next month
+        widget._on_click(TestEvent(widget=widget._calendar[5][0]))
+        self.assertEqual(widget.selection_get(), date(2016, 1, 4))
+        widget.update_display()
+        self.assertEqual(widget._date, date(2016, 1, 1))
+        self.assertEqual(widget._sel_cells, set([(1, 0)]))
+
+    def test_calendar_display_diff(self):
+        widget = Calendar(self.window, year=2018, month=2, day=5, firstweekday=calendar.MONDAY)
+        widget.pack()
+        self.window.update()
+        self.assertEqual(widget._display_calendar(), 0)
+        widget._date = date(2018, 3, 1)
+        updated = widget._display_calendar()
+        self.assertGreater(updated, 0)
+        self.assertLessEqual(updated, 48)
+        self.assertEqual(widget._display_calendar(), 0)
+        self.assertEqual(widget._calendar[0][0].cget('text'), '26')
+        self.assertEqual(str(widget._calendar[0][0].cget('style')),
+                         'normal_om.%s.TLabel' % widget._style_prefixe)
+        widget.selection_set(date(2018, 3, 4))
+        widget.update_display()
+        self.assertEqual(str(widget._calendar[0][6].cget('style')),
+                         'sel.%s.TLabel' % widget._style_prefixe)
+        widget.selection_set(date(2018, 3, 5))
+        widget.update_display()
+        self.assertEqual(str(widget._calendar[0][6].cget('style')),
+                         'we.%s.TLabel' % widget._style_prefixe)
+
+    def test_calendar_render_coalescing(self):
+        widget = Calendar(self.window, year=2018, month=3, day=5, firstweekday=calendar.MONDAY)
+        widget.pack()
+        self.window.update()
+        widget.instrumentation_enable()
+        # same month: only the selection is redrawn
+        widget.selection_set(date(2018, 3, 6))
+        widget.selection_set(date(2018, 3, 7))
+        self.window.update()
+        timings = widget.instrumentation_get()['timings']
+        self.assertNotIn('_display_calendar', timings)
+        self.assertEqual(timings['_display_selection']['count'], 1)
+        self.assertEqual(str(widget._calendar[1][2].cget('style')),
+                         'sel.%s.TLabel' % widget._style_prefixe)
+        self.assertEqual(str(widget._calendar[1][1].cget('style')),
+                         'normal.%s.TLabel' % widget._style_prefixe)
+        # other month and several navigations: a single redraw
+        widget.instrumentation_reset()
+        widget.selection_set(date(2018, 5, 1))
+        widget._next_month()
+        widget._prev_month()
+        self.window.update()
+        timings = widget.instrumentation_get()['timings']
+        self.assertEqual(timings['_display_calendar']['count'], 1)
+        self.assertNotIn('_display_selection', timings)
+        self.assertEqual(widget._header_month.cget('text'), widget._month_names[5].title())
+        # click on a day of the next month
+        widget.instrumentation_reset()
+        widget._select_clicked_day(date(2018, 6, 2))
+        self.window.update()
+        timings = widget.instrumentation_get()['timings']
+        self.assertEqual(timings['_display_calendar']['count'], 1)
+        self.assertEqual(widget.selection_get(), date(2018, 6, 2))
+        # synchronous update
+        widget._next_month()
+        widget.update_display()
+        self.assertIsNone(widget._render_after_id)
+        self.assertEqual(widget._header_month.cget('text'), widget._month_names[7].title())
+
+    def test_calendar_canvas(self):
+        with self.assertRaises(ValueError):
+            Calendar(self.window, engine='wrong')
+        widget = Calendar(self.window, engine='canvas', year=2018, month=3, day=5,
+                          firstweekday=calendar.MONDAY,
+                          selectbackground='red', normalbackground='white')
+        widget.pack()
+        self.window.update()
+        self.assertEqual(widget['engine'], 'canvas')
+        self.assertFalse(hasattr(widget, '_calendar'))
+        rect, text = widget._canvas_cells[1][0]
+        self.assertEqual(widget._canvas.itemcget(text, 'text'), '5')
+        self.assertEqual(widget._canvas.itemcget(rect, 'fill'), 'red')
+        rect, text = widget._canvas_cells[1][1]
+        self.assertEqual(widget._canvas.itemcget(rect, 'fill'), 'white')
+        # click on the 6th
+        x = (widget._canvas_xs[1] + widget._canvas_xs[2]) // 2
+        y = (widget._canvas_ys[1] + widget._canvas_ys[2]) // 2
+        widget._on_canvas_click(TestEvent(x=x, y=y))
+        self.assertEqual(widget.selection_get(), date(2018, 3, 6))
+        widget.update_display()
+        self.assertEqual(widget._canvas.itemcget(rect, 'fill'), 'red')
+        # click on the first cell, in february
+        x = (widget._canvas_xs[0] + widget._canvas_xs[1]) // 2
+        y = (widget._canvas_ys[0] + widget._canvas_ys[1]) // 2
+        widget._on_canvas_click(TestEvent(x=x, y=y))
+        self.assertEqual(widget.selection_get(), date(2018, 2, 26))
+        widget.configure(selectbackground='blue', showweeknumbers=False,
+                         font='Arial 16', borderwidth=4)
+        self.window.update()
+        rect, text = widget._canvas_cells[4][0]
+        self.assertEqual(widget._canvas.itemcget(rect, 'fill'), 'blue')
+        self.assertEqual(widget._canvas.itemcget(widget._canvas_week_nbs[0][1], 'state'), 'hidden')
+        widget.configure(state='disabled')
+        self.window.update()
+        self.assertEqual(widget._canvas.itemcget(rect, 'fill'),
+                         widget['disabledselectbackground'])
+        widget._on_canvas_click(TestEvent(x=x, y=y))
+        self.assertEqual(widget.selection_get(), date(2018, 2, 26))
+
+    def test_calendar_range_selection(self):
+        widget = Calendar(self.window, selectmode='range', year=2018, month=3,
+                          firstweekday=calendar.MONDAY)
+        widget.pack()
+        self.window.update()
+        self.assertIsNone(widget.selection_get())
+        self.assertEqual(widget.get_date(), "")
+        # the grid of march 2018 starts on monday 26 february
+        widget._on_click(TestEvent(widget=widget._calendar[1][0]))  # 5 march
+        self.assertIsNone(widget.selection_get())
+        widget._on_enter(TestEvent(widget=widget._calendar[2][2]))  # 14 march
+        widget.update_display()
+        self.assertEqual(widget._sel_cells,
+                         set([(1, j) for j in range(7)] + [(2, 0), (2, 1), (2, 2)]))
+        self.assertEqual(widget._cells_shadow[2][2], ('14', 'sel'))
+        # only the cell entering the range is restyled
+        widget.instrumentation_enable()
+        widget._on_enter(TestEvent(widget=widget._calendar[2][3]))
+        widget.update_display()
+        self.assertEqual(widget.instrumentation_get()['calls']['configure'], 1)
+        widget.instrumentation_enable(False)
+        # backwards
+        widget._on_enter(TestEvent(widget=widget._calendar[0][5]))  # 3 march
+        widget.update_display()
+        self.assertEqual(widget._sel_cells, set([(0, 5), (0, 6), (1, 0)]))
+        self.assertEqual(widget._cells_shadow[2][2], ('14', 'normal'))
+        widget._on_click(TestEvent(widget=widget._calendar[0][5]))
+        self.assertEqual(widget.selection_get(), (date(2018, 3, 3), date(2018, 3, 5)))
+        self.assertEqual(widget.get_date(), (widget.format_date(date(2018, 3, 3)),
+                                             widget.format_date(date(2018, 3, 5))))
+        # hovering without a pending range does nothing
+        widget._on_enter(TestEvent(widget=widget._calendar[3][3]))
+        widget.update_display()
+        self.assertEqual(widget._sel_cells, set([(0, 5), (0, 6), (1, 0)]))
+
+        widget.selection_set((date(2018, 4, 20), date(2018, 3, 30)))
+        self.assertEqual(widget.selection_get(), (date(2018, 3, 30), date(2018, 4, 20)))
+        widget.update_display()
+        self.assertEqual(len(widget._sel_cells), 10)
+        widget._next_month()
+        widget.update_display()
+        self.assertEqual(len(widget._sel_cells), 22)
+        widget.selection_set(None)
+        self.assertIsNone(widget.selection_get())
+        widget.configure(selectmode='day')
+        self.assertIsNone(widget.selection_get())
+
+        widget = Calendar(self.window, selectmode='range', engine='canvas',
+                          firstweekday=calendar.MONDAY,
+                          year=2018, month=3)
+        widget.pack()
+        self.window.update()
+
+        def center(i_week, i_day):
+            x = (widget._canvas_xs[i_day] + widget._canvas_xs[i_day + 1]) // 2
+            y = (widget._canvas_ys[i_week] + widget._canvas_ys[i_week + 1]) // 2
+            return TestEvent(x=x, y=y)
+
+        widget._on_canvas_click(center(1, 0))
+        widget._on_canvas_motion(center(1, 3))
+        widget.update_display()
+        self.assertEqual(widget._sel_cells, set([(1, 0), (1, 1), (1, 2), (1, 3)]))
+        widget._on_canvas_click(center(1, 3))
+        self.assertEqual(widget.selection_get(), (date(2018, 3, 5), date(2018, 3, 8)))
+
+    def test_calendar_multiple_selection(self):
+        widget = Calendar(self.window, selectmode='multiple', year=2018, month=3,
+                          firstweekday=calendar.MONDAY)
+        widget.pack()
+        self.window.update()
+        self.assertEqual(widget.selection_get(), ())
+        events = []
+        widget.bind('<<CalendarSelected>>', lambda e: events.append(e))
+        # the grid of march 2018 starts on monday 26 february
+        widget._on_click(TestEvent(widget=widget._calendar[1][0]))
+        widget._on_click(TestEvent(widget=widget._calendar[1][2]))
+        widget._on_click(TestEvent(widget=widget._calendar[1][0]))
+        self.window.update()
+        self.assertEqual(widget.selection_get(), (date(2018, 3, 7),))
+        self.assertEqual(widget._sel_cells, set([(1, 2)]))
+        self.assertEqual(len(events), 3)
+        del events[:]
+
+        start = date(2018, 1, 1).toordinal()
+        days = [date.fromordinal(start + 2 * i) for i in range(300)]
+        widget.instrumentation_enable()
+        widget.selection_add(days)
+        self.window.update()
+        stats = widget.instrumentation_get()
+        self.assertEqual(stats['timings']['_display_selection']['count'], 1)
+        self.assertEqual(stats['events'], {'<<CalendarSelected>>': 1})
+        self.assertEqual(len(events), 1)
+        self.assertEqual(len(widget.selection_get()), 301)
+        self.assertEqual(widget._sel_cells,
+                         set(divmod(i, 7) for i in range(42) if i % 2 == 0) | set([(1, 2)]))
+        widget.selection_add(days[:10])  # no change
+        self.assertEqual(len(events), 1)
+        widget.selection_remove(days + [widget.format_date(date(2018, 3, 7))])
+        self.window.update()
+        self.assertEqual(widget.selection_get(), ())
+        self.assertEqual(widget._sel_cells, set())
+        self.assertEqual(len(events), 2)
+        widget.instrumentation_enable(False)
+
+        widget.selection_set([date(2018, 3, 1), date(2018, 2, 1)])
+        self.assertEqual(widget.selection_get(), (date(2018, 2, 1), date(2018, 3, 1)))
+        self.assertEqual(widget.get_date(), (widget.format_date(date(2018, 2, 1)),
+                                             widget.format_date(date(2018, 3, 1))))
+        widget.selection_add(datetime(2018, 3, 2, 12))
+        self.assertEqual(widget.selection_get(), (date(2018, 2, 1), date(2018, 3, 1), date(2018, 3, 2)))
+        widget.selection_clear()
+        self.assertEqual(widget.selection_get(), ())
+        self.assertEqual(len(events), 4)
+        widget.selection_clear()
+        self.assertEqual(len(events), 4)
+        # a single string (unicode in Python 2) is a single date
+        widget.selection_add(widget.format_date(date(2018, 3, 2)))
+        self.assertEqual(widget.selection_get(), (date(2018, 3, 2),))
+
+    def test_calendar_disabled_days(self):
+        calls = []
+
+        def weekends(day):
+            calls.append(day)
+            return day.weekday() > 4
+
+        with self.assertRaises(ValueError):
+            Calendar(self.window, mindate=date(2018, 3, 1), maxdate=date(2018, 2, 1))
+        with self.assertRaises(ValueError):
+            Calendar(self.window, disableddays=True)
+        widget = Calendar(self.window, year=2018, month=6, mindate=date(2018, 2, 10),
+                          firstweekday=calendar.MONDAY,
+                          maxdate=date(2018, 4, 20), disableddays=weekends)
+        widget.pack()
+        self.window.update()
+        # the displayed month is brought within the bounds
+        self.assertEqual(widget._date, date(2018, 4, 1))
+        self.assertIn('disabled', widget._r_month.state())
+        self.assertIn('disabled', widget._r_year.state())
+        self.assertNotIn('disabled', widget._l_month.state())
+        # the predicate is only called for the days within the bounds:
+        # 26 march - 20 april
+        self.assertEqual(len(calls), 26)
+        # the grid of april 2018 starts on monday 26 march
+        self.assertEqual(widget._cells_shadow[0][0], ('26', 'normal_om'))
+        self.assertEqual(widget._cells_shadow[0][6], ('1', 'disabled'))
+        self.assertEqual(widget._cells_shadow[3][5], ('21', 'disabled'))
+        self.assertEqual(widget._cells_shadow[3][4], ('20', 'normal'))
+        self.assertEqual(str(widget._calendar[0][6].cget('style')),
+                         'disabled.%s.TLabel' % widget._style_prefixe)
+        widget._next_month()
+        widget._next_year()
+        self.window.update()
+        self.assertEqual(widget._date, date(2018, 4, 1))
+        # clicks on disabled days are ignored
+        widget._on_click(TestEvent(widget=widget._calendar[0][6]))
+        widget._on_click(TestEvent(widget=widget._calendar[3][5]))
+        self.assertIsNone(widget.selection_get())
+        widget._on_click(TestEvent(widget=widget._calendar[3][4]))
+        self.assertEqual(widget.selection_get(), date(2018, 4, 20))
+        # the results are cached per month
+        widget._prev_year()
+        self.window.update()
+        self.assertEqual(widget._date, date(2018, 2, 1))
+        self.assertIn('disabled', widget._l_month.state())
+        self.assertNotIn('disabled', widget._r_month.state())
+        widget._prev_month()
+        widget._next_month()
+        self.window.update()
+        widget._next_month()
+        widget._next_month()
+        self.window.update()
+        self.assertEqual(widget._date, date(2018, 4, 1))
+        # + 10 february - 11 march, + the whole grid of march
+        self.assertEqual(len(calls), 26 + 30 + 42)
+        widget.invalidate_disabled_days()
+        self.window.update()
+        self.assertEqual(len(calls), 26 + 30 + 42 + 26)
+        widget.configure(maxdate=None, disableddays=None)
+        self.window.update()
+        self.assertEqual(widget._cells_shadow[3][5], ('21', 'we'))
+        self.assertNotIn('disabled', widget._r_month.state())
+        widget._next_year()
+        self.window.update()
+        self.assertEqual(widget._date, date(2019, 4, 1))
+        widget.configure(state='disabled')
+        self.assertIn('disabled', widget._r_month.state())
+        widget.configure(state='normal')
+        self.assertNotIn('disabled', widget._r_month.state())
+        # the new bounds are checked together, not with the current ones
+        widget.configure(maxdate=date(2017, 3, 31), mindate=datetime(2017, 1, 1, 12))
+        self.assertEqual(widget['mindate'], date(2017, 1, 1))
+        self.assertEqual(widget._date, date(2017, 3, 1))
+        widget.configure(mindate=date(2019, 1, 1), maxdate=date(2019, 12, 31))
+        self.assertEqual(widget._date, date(2019, 1, 1))
+        with self.assertRaises(ValueError):
+            widget.configure(maxdate=date(2018, 12, 31))
+        with self.assertRaises(ValueError):
+            widget.configure(mindate='2019-01-01')
+        with self.assertRaises(ValueError):
+            widget.configure(disableddays=1)
+        self.assertEqual(widget['maxdate'], date(2019, 12, 31))
+        widget.configure(mindate=None, maxdate=None)
+
+        widget = Calendar(self.window, engine='canvas', year=2018, month=4,
+                          firstweekday=calendar.MONDAY,
+                          maxdate=date(2018, 4, 20), disableddaybackground='gray')
+        widget.pack()
+        self.window.update()
+        rect = widget._canvas_cells[3][5][0]
+        self.assertEqual(widget._canvas.itemcget(rect, 'fill'), 'gray')
+
+    def test_calendar_keyboard(self):
+        var = tk.StringVar(self.window)
+        widget = Calendar(self.window, year=2018, month=3, day=15, textvariable=var,
+                          firstweekday=calendar.MONDAY)
+        widget.pack()
+        self.window.update()
+        widget._key_move(days=1)
+        widget._key_move(days=7)
+        self.assertEqual(widget.selection_get(), date(2018, 3, 23))
+        widget._key_move(months=-1)
+        self.window.update()
+        self.assertEqual(widget.selection_get(), date(2018, 2, 23))
+        self.assertEqual(var.get(), format_date(date(2018, 2, 23), 'short'))
+        self.assertEqual(widget._cells_shadow[3][4], ('23', 'sel'))
+        # auto-repeated keys are rendered once
+        widget.instrumentation_enable()
+        for i in range(3):
+            widget._key_move(months=1)
+        self.assertEqual(var.get(), format_date(date(2018, 2, 23), 'short'))
+        widget.update_display()
+        stats = widget.instrumentation_get()
+        widget.instrumentation_enable(False)
+        self.assertEqual(stats['timings']['_display_calendar']['count'], 1)
+        self.assertNotIn('parse_date', stats['timings'])
+        self.assertEqual(stats['events'], {})
+        self.assertEqual(widget._date, date(2018, 5, 1))
+        self.assertEqual(var.get(), format_date(date(2018, 5, 23), 'short'))
+        widget._key_move(edge='end')
+        self.assertEqual(widget.selection_get(), date(2018, 5, 31))
+        widget._key_move(edge='home')
+        self.assertEqual(widget.selection_get(), date(2018, 5, 1))
+        widget._key_move(months=-3)
+        self.assertEqual(widget.selection_get(), date(2018, 2, 1))
+        widget._key_move(edge='end')
+        self.assertEqual(widget.selection_get(), date(2018, 2, 28))
+        self.window.update()
+        self.assertEqual(widget._on_return(None), 'break')
+        self.assertEqual(widget.selection_get(), date(2018, 2, 28))
+
+        # bounds and disabled days are skipped
+        widget.configure(maxdate=date(2018, 3, 6), disableddays=lambda d: d.weekday() > 4)
+        widget._key_move(days=2)
+        self.assertEqual(widget.selection_get(), date(2018, 3, 2))
+        widget._key_move(days=1)
+        self.assertEqual(widget.selection_get(), date(2018, 3, 5))
+        widget._key_move(months=1)
+        self.assertEqual(widget.selection_get(), date(2018, 3, 6))
+        widget._key_move(days=-2)
+        self.assertEqual(widget.selection_get(), date(2018, 3, 2))
+        widget.configure(state='disabled')
+        widget._key_move(days=1)
+        self.assertEqual(widget.selection_get(), date(2018, 3, 2))
+
+        # multiple mode: the cursor is previewed toggled
+        widget = Calendar(self.window, selectmode='multiple', year=2018, month=3,
+                          firstweekday=calendar.MONDAY)
+        widget.pack()
+        self.window.update()
+        widget.selection_set([date(2018, 3, 2)])
+        # the first key press puts the cursor on the first day of the month
+        widget._key_move(days=1)
+        self.window.update()
+        self.assertEqual(widget._cells_shadow[0][3], ('1', 'sel'))
+        self.assertEqual(widget._cells_shadow[0][4], ('2', 'sel'))
+        widget._key_move(days=1)
+        self.window.update()
+        self.assertEqual(widget._cells_shadow[0][3], ('1', 'normal'))
+        self.assertEqual(widget._cells_shadow[0][4], ('2', 'normal'))
+        widget._on_return(None)
+        self.window.update()
+        self.assertEqual(widget.selection_get(), ())
+        self.assertEqual(widget._cells_shadow[0][4], ('2', 'normal'))
+
+        # range mode: Return sets the ends of the range
+        widget = Calendar(self.window, selectmode='range', year=2018, month=3,
+                          firstweekday=calendar.MONDAY)
+        widget.pack()
+        self.window.update()
+        widget._key_move(days=7)
+        widget._on_return(None)
+        for i in range(3):
+            widget._key_move(days=1)
+        self.window.update()
+        self.assertEqual(widget._cells_shadow[0][3], ('1', 'sel'))
+        self.assertEqual(widget._cells_shadow[0][6], ('4', 'sel'))
+        widget._on_return(None)
+        self.assertEqual(widget.selection_get(), (date(2018, 3, 1), date(2018, 3, 4)))
+
+    def test_calendar_firstweekday(self):
+        with self.assertRaises(ValueError):
+            Calendar(self.window, firstweekday=7)
+        widget = Calendar(self.window, locale='en_US', year=2020, month=12, day=31)
+        widget.pack()
+        self.window.update()
+        self.assertEqual(widget['firstweekday'], calendar.SUNDAY)
+        self.assertEqual(widget._headers[1].cget('text'), 'Sun')
+        self.assertEqual(widget._cells_shadow[0][0], ('29', 'we_om'))
+        self.assertEqual(widget._week_nbs_shadow, ['49', '50', '51', '52', '53', '1'])
+        widget.configure(firstweekday=calendar.MONDAY)
+        self.assertEqual(widget._headers[1].cget('text'), 'Mon')
+        self.assertEqual(widget._headers[7].cget('text'), 'Sun')
+        self.window.update()
+        self.assertEqual(widget._cells_shadow[0][0], ('30', 'normal_om'))
+        self.assertEqual(widget._cells_shadow[4][3], ('31', 'sel'))
+        with self.assertRaises(ValueError):
+            widget.configure(firstweekday='monday')
+
+        widget = Calendar(self.window, locale='fr_FR', engine='canvas', year=2021, month=1)
+        widget.pack()
+        self.window.update()
+        self.assertEqual(widget['firstweekday'], calendar.MONDAY)
+        self.assertEqual(widget._week_nbs_shadow, ['53', '1', '2', '3', '4', '5'])
+        widget.configure(firstweekday=calendar.SATURDAY)
+        text = widget._canvas_headers[1][1]
+        self.assertEqual(widget._canvas.itemcget(text, 'text'), widget._day_names[calendar.SATURDAY])
+
+    def test_calendar_calevents(self):
+        for engine in ['label', 'canvas']:
+            widget = Calendar(self.window, year=2018, month=3, day=5, engine=engine,
+                              firstweekday=calendar.MONDAY)
+            widget.pack()
+            self.window.update()
+            # a single tag, unicode in Python 2
+            ev1 = widget.calevent_create(date(2018, 3, 8), 'Meeting', u'work')
+            ev2 = widget.calevent_create(date(2018, 3, 8), 'Birthday', ['perso', 'work'])
+            ev3 = widget.calevent_create(date(2018, 4, 2), 'Holiday', [])
+            with self.assertRaises(TypeError):
+                widget.calevent_create('2018-03-08', 'Meeting')
+            self.assertEqual(widget.get_calevents(), (ev1, ev2, ev3))
+            self.assertEqual(widget.get_calevents(date(2018, 3, 8)), (ev1, ev2))
+            self.assertEqual(widget.get_calevents(tag='work'), (ev1, ev2))
+            self.assertEqual(widget.get_calevents(date(2018, 3, 8), 'perso'), (ev2,))
+            self.assertEqual(widget.calevent_cget(ev1, 'tags'), ['work'])
+            self.assertEqual(widget.calevent_cget(ev2, 'tags'), ['perso', 'work'])
+            self.assertEqual(widget.calevent_cget(ev1, 'text'), 'Meeting')
+            with self.assertRaises(ValueError):
+                widget.calevent_cget(ev1, 'color')
+            self.assertEqual(sorted(widget.tag_names()), ['perso', 'work'])
+            widget.tag_config('perso', background='red', foreground='yellow')
+            self.assertEqual(widget.tag_cget('perso', 'background'), 'red')
+            self.assertEqual(widget.tag_cget('work', 'foreground'), 'white')
+            with self.assertRaises(ValueError):
+                widget.tag_config('perso', color='red')
+            self.window.update()
+            perso = widget._tags['perso']['style']
+            work = widget._tags['work']['style']
+            self.assertEqual(widget._cells_shadow[1][3], ('8', perso))
+            if engine == 'canvas':
+                rect = widget._canvas_cells[1][3][0]
+                self.assertEqual(widget._canvas.itemcget(rect, 'fill'), 'red')
+            else:
+                self.assertEqual(str(widget._calendar[1][3].cget('style')),
+                                 '%s.%s.TLabel' % (perso, widget._style_prefixe))
+                self.assertEqual(str(self.window.tk.call('ttk::style', 'configure',
+                                                         '%s.%s.TLabel' % (perso, widget._style_prefixe),
+                                                         '-background')), 'red')
+            # no tag, no style
+            self.assertEqual(widget._cells_shadow[5][0], ('2', 'normal_om'))
+            widget.calevent_remove(ev2)
+            self.window.update()
+            self.assertEqual(widget._cells_shadow[1][3], ('8', work))
+            widget.calevent_configure(ev1, date=date(2018, 3, 9), tags=['perso'])
+            self.window.update()
+            self.assertEqual(widget._cells_shadow[1][3], ('8', 'normal'))
+            self.assertEqual(widget._cells_shadow[1][4], ('9', perso))
+            widget.selection_set(date(2018, 3, 9))
+            self.window.update()
+            self.assertEqual(widget._cells_shadow[1][4], ('9', 'sel'))
+            widget.selection_set(None)
+            widget.tag_delete('perso')
+            self.assertEqual(widget._cells_shadow[1][4], ('9', 'normal'))
+            self.assertEqual(widget.calevent_cget(ev1, 'tags'), [])
+            widget.calevent_remove(tag='work')
+            widget.calevent_remove('all')
+            self.assertEqual(widget.get_calevents(), ())
+            with self.assertRaises(ValueError):
+                widget.calevent_remove(ev1)
+            widget.destroy()
+
+    def test_calendar_calevents_bulk(self):
+        widget = Calendar(self.window, year=2018, month=3, day=5, firstweekday=calendar.MONDAY)
+        widget.pack()
+        self.window.update()
+        widget.tag_config('booking', background='red')
+        start = date(2000, 1, 1).toordinal()
+        days = [date.fromordinal(start + i % 20000) for i in range(100000)]
+        t0 = time.time()
+        for day in days:
+            widget.calevent_create(day, 'booking', 'booking')
+        self.window.update()
+        self.assertLess(time.time() - t0, 2)
+        self.assertEqual(len(widget.get_calevents(date(2018, 3, 8))), 5)
+        self.assertEqual(widget._cells_shadow[1][3][1], widget._tags['booking']['style'])
+
+    def test_calendar_shared_styles(self):
+        widget1 = Calendar(self.window, background='red')
+        widget2 = Calendar(self.window, background='red')
+        widget1.pack()
+        widget2.pack()
+        self.window.update()
+        registry = widget1._style_registry
+        nb_sets = len(registry)
+        self.assertEqual(widget1._style_prefixe, widget2._style_prefixe)
+        widget2.configure(foreground='yellow')
+        self.window.update()
+        self.assertNotEqual(widget1._style_prefixe, widget2._style_prefixe)
+        self.assertEqual(len(registry), nb_sets + 1)
+        self.assertEqual(str(widget2._calendar[0][0].cget('style')).split('.')[1],
+                         widget2._style_prefixe)
+        self.assertEqual(str(self.window.tk.call('ttk::style', 'configure',
+                                                 'main.%s.TLabel' % widget2._style_prefixe,
+                                                 '-foreground')), 'yellow')
+        widget2.configure(foreground=widget1['foreground'])
+        self.assertEqual(widget1._style_prefixe, widget2._style_prefixe)
+        self.assertEqual(len(registry), nb_sets)
+        widget3 = Calendar(self.window, background='blue')
+        self.assertEqual(len(registry), nb_sets + 1)
+        widget3.destroy()
+        self.assertEqual(len(registry), nb_sets)
+
+    def test_calendar_configure_batch(self):
+        widget = Calendar(self.window, background='#010203')
+        widget.pack()
+        self.window.update()
+        prefix = widget._style_prefixe
+        calls = []
+
+        def configure(style, **kw):
+            calls.append(('configure', style))
+            return ttk.Style.configure(widget.style, style, **kw)
+
+        def map(style, **kw):
+            calls.append(('map', style))
+            return ttk.Style.map(widget.style, style, **kw)
+
+        widget.style.configure = configure
+        widget.style.map = map
+        widget.configure(background='#040506', foreground='#070809',
+                         normalbackground='#0a0b0c', disableddaybackground='#0d0e0f',
+                         disableddayforeground='#101112')
+        # the style set is not shared: it is modified in place
+        self.assertEqual(widget._style_prefixe, prefix)
+        self.assertEqual(sorted(calls),
+                         sorted([('configure', 'main.%s.TFrame' % prefix),
+                                 ('configure', 'main.%s.TLabel' % prefix),
+                                 ('configure', 'R.%s.TButton' % prefix),
+                                 ('configure', 'L.%s.TButton' % prefix),
+                                 ('configure', 'normal.%s.TLabel' % prefix),
+                                 ('map', '%s.TLabel' % prefix)]))
+        self.assertEqual(str(self.window.tk.call('ttk::style', 'configure',
+                                                 'R.%s.TButton' % prefix,
+                                                 '-arrowcolor')), '#070809')
+
+    def test_calendar_configure_shared(self):
+        widgets = [Calendar(self.window, background='#010203') for i in range(5)]
+        for widget in widgets:
+            widget.pack()
+        self.window.update()
+        registry = widgets[0]._style_registry
+        nb_sets = len(registry)
+        prefix = widgets[0]._style_prefixe
+        for widget in widgets:
+            widget.instrumentation_enable()
+        # all the calendars of the set change to the same colors: the set
+        # is modified in place once
+        for widget in widgets:
+            widget.configure(background='#040506', foreground='#070809')
+        self.window.update()
+        stats = [widget.instrumentation_get()['calls'] for widget in widgets]
+        for widget in widgets:
+            widget.instrumentation_enable(False)
+        self.assertEqual([widget._style_prefixe for widget in widgets], [prefix] * 5)
+        self.assertEqual(len(registry), nb_sets)
+        self.assertEqual(sum(calls.get('configure', 0) for calls in stats), 0)
+        self.assertEqual(sum(calls.get('ttk::style configure', 0) for calls in stats), 4)
+        self.assertEqual(str(self.window.tk.call('ttk::style', 'configure',
+                                                 'main.%s.TLabel' % prefix,
+                                                 '-foreground')), '#070809')
+        # only some of them change: they move to another set
+        for widget in widgets[:2]:
+            widget.configure(foreground='#0a0b0c')
+        self.window.update()
+        self.assertEqual(widgets[0]._style_prefixe, widgets[1]._style_prefixe)
+        self.assertNotEqual(widgets[0]._style_prefixe, prefix)
+        self.assertEqual([widget._style_prefixe for widget in widgets[2:]], [prefix] * 3)
+        self.assertEqual(str(self.window.tk.call('ttk::style', 'configure',
+                                                 'main.%s.TLabel' % prefix,
+                                                 '-foreground')), '#070809')
+        self.assertEqual(str(widgets[0]._calendar[0][0].cget('style')).split('.')[1],
+                         widgets[0]._style_prefixe)
+        # destroyed before the pending change is applied
+        widgets[2].configure(foreground='#0d0e0f')
+        widgets[2].destroy()
+        self.window.update()
+        self.assertEqual(len(registry), nb_sets + 1)
 
     def test_calendar_textvariable(self):
         var = tk.StringVar(self.window)
@@ -196,7 +1130,12 @@ class TestCalendar(BaseWidgetTest):
                    'selectmode',
                    'textvariable',
                    'locale',
+                   'engine',
                    'showweeknumbers',
+                   'firstweekday',
+                   'mindate',
+                   'maxdate',
+                   'disableddays',
                    'selectbackground',
                    'selectforeground',
                    'disabledselectbackground',
@@ -257,12 +1196,48 @@ class TestCalendar(BaseWidgetTest):
             widget.config(locale="en_US.UTF-8")
         with self.assertRaises(AttributeError):
             widget.config(test="test")
-        dic = {op: "yellow" for op in options[7:]}
+        with self.assertRaises(AttributeError):
+            widget.config(engine="canvas")
+        colors = [op for op in options[8:]
+                  if op not in ('firstweekday', 'mindate', 'maxdate', 'disableddays')]
+        dic = {op: "yellow" for op in colors}
         widget.configure(**dic)
         self.window.update()
-        for op in options[7:]:
+        for op in colors:
             self.assertEqual(widget.cget(op), "yellow")
 
+    def test_calendar_instrumentation(self):
+        widget = Calendar(self.window, selectmode='day')
+        widget.pack()
+        self.window.update()
+        self.assertNotIn('_display_calendar', widget.__dict__)
+        self.assertEqual(widget.instrumentation_get(),
+                         {'calls': {}, 'events': {}, 'timings': {}})
+        widget.instrumentation_enable()
+        self.assertIn('_display_calendar', widget.__dict__)
+        widget._next_month()
+        widget.configure(background='#010203')
+        widget._select_clicked_day(widget._date.replace(day=15))
+        widget.update_display()
+        stats = widget.instrumentation_get()
+        self.assertEqual(stats['timings']['_display_calendar']['count'], 1)
+        self.assertGreaterEqual(stats['timings']['_display_calendar']['time'], 0)
+        self.assertIn('_setup_style', stats['timings'])
+        self.assertGreater(stats['calls']['configure'], 0)
+        self.assertGreater(stats['calls']['ttk::style configure'], 0)
+        self.assertEqual(stats['events'], {'<<CalendarSelected>>': 1})
+        widget.instrumentation_reset()
+        self.assertEqual(widget.instrumentation_get(),
+                         {'calls': {}, 'events': {}, 'timings': {}})
+        widget.instrumentation_enable(False)
+        self.assertNotIn('_display_calendar', widget.__dict__)
+        self.assertIs(widget.tk, self.window.tk)
+        self.assertIs(widget._calendar[0][0].tk, self.window.tk)
+        self.assertIs(widget.style.tk, self.window.tk)
+        widget._next_month()
+        self.assertEqual(widget.instrumentation_get(),
+                         {'calls': {}, 'events': {}, 'timings': {}})
+
 
 class TestDateEntry(BaseWidgetTest):
     def test_dateentry_init(self):
@@ -275,6 +1250,26 @@ class TestDateEntry(BaseWidgetTest):
         widget.pack()
         self.window.update()
         widget.destroy()
+        # the options of the drop-down calendar are checked at once
+        for kw in [{'borderwidth': 'a'}, {'selectmode': 'week'}, {'selectmode': 'range'},
+                   {'firstweekday': 7}, {'engine': 'text'}]:
+            with self.assertRaises(ValueError):
+                DateEntry(self.window, **kw)
+        widget = DateEntry(self.window, locale='de_DE', engine='canvas')
+        with self.assertRaises(ValueError):
+            widget.configure(firstweekday=-1)
+        for selectmode in ('range', 'multiple'):
+            with self.assertRaises(ValueError):
+                widget.configure(selectmode=selectmode)
+        # configuring an entry which was never dropped down does not
+        # create the drop-down calendar
+        widget.configure(background='red', firstweekday=calendar.SUNDAY)
+        self.assertIsNone(widget._find_dropdown())
+        widget.pack()
+        widget.drop_down()
+        self.window.update()
+        self.assertEqual(widget._find_dropdown().calendar['background'], 'red')
+        widget.destroy()
 
     def test_dateentry_drop_down(self):
         """Check whether drop down opens on click."""
@@ -287,6 +1282,71 @@ class TestDateEntry(BaseWidgetTest):
         self.window.update()
         self.assertTrue(widget._top_cal.winfo_ismapped())
 
+    def test_dateentry_shared_drop_down(self):
+        widget1 = DateEntry(self.window, background='red')
+        widget2 = DateEntry(self.window, background='blue', year=2012, month=3, day=4)
+        widget3 = DateEntry(self.window, locale='fr_FR')
+        for widget in (widget1, widget2, widget3):
+            widget.pack()
+        self.window.update()
+        dropdowns = widget1._root().__dict__.get('_tkcalendar_registries', {}).get('dropdowns', {})
+        for dropdown in dropdowns.values():
+            self.assertIsNot(dropdown.owner, widget1)
+            self.assertIsNot(dropdown.owner, widget2)
+        widget1.drop_down()
+        self.window.update()
+        dropdown = widget1._get_dropdown()
+        self.assertIs(dropdown.owner, widget1)
+        self.assertEqual(dropdown.calendar['background'], 'red')
+        widget2.drop_down()
+        self.window.update()
+        self.assertIs(widget2._get_dropdown(), dropdown)
+        self.assertIs(dropdown.owner, widget2)
+        self.assertEqual(dropdown.calendar['background'], 'blue')
+        self.assertEqual(dropdown.calendar.selection_get(), date(2012, 3, 4))
+        self.assertIsNot(widget3._get_dropdown(), dropdown)
+        widget1.configure(background='green')
+        self.assertEqual(dropdown.calendar['background'], 'blue')
+        self.assertEqual(widget1['background'], 'green')
+        widget2.configure(foreground='yellow')
+        self.assertEqual(dropdown.calendar['foreground'], 'yellow')
+        widget1.drop_down()
+        self.window.update()
+        self.assertEqual(dropdown.calendar['background'], 'green')
+        self.assertEqual(dropdown.calendar['foreground'], widget1['foreground'])
+        widget1.destroy()
+        self.assertIsNone(dropdown.owner)
+        self.assertFalse(dropdown.top.winfo_ismapped())
+
+    def test_dateentry_dialog_drop_down(self):
+        # the drop-down calendar is a child of the window of the entry so
+        # that it is inside the grab of a modal dialog
+        dialog = tk.Toplevel(self.window)
+        widget1 = DateEntry(dialog)
+        widget1.pack()
+        self.window.update()
+        dialog.grab_set()
+        widget1.drop_down()
+        self.window.update()
+        dropdown = widget1._find_dropdown()
+        self.assertEqual(dropdown.top.winfo_parent(), str(dialog))
+        self.assertIsNot(dropdown, DateEntry(self.window)._get_dropdown())
+        widget1.drop_down()
+        dialog.grab_release()
+        # the drop-down calendar is destroyed before its owner
+        frame = ttk.Frame(dialog)
+        frame.pack()
+        widget2 = DateEntry(frame)
+        widget2.pack()
+        self.window.update()
+        widget2.drop_down()
+        self.window.update()
+        self.assertIs(dropdown.owner, widget2)
+        dialog.destroy()
+        self.assertIsNone(dropdown.owner)
+        dropdowns = self.window._root().__dict__['_tkcalendar_registries']['dropdowns']
+        self.assertNotIn(dropdown, dropdowns.values())
+
     def test_dateentry_get_set(self):
         widget = DateEntry(self.window, width=12, background='darkblue',
                            foreground='white', borderwidth=2, font='Arial 9')
@@ -348,6 +1408,17 @@ class TestDateEntry(BaseWidgetTest):
         widget._on_b1_press(TestEvent(x=widget.winfo_width() - 2, y=2))
         widget._on_focus_out_cal(TestEvent(x=10, y=20))
 
+        widget.configure(mindate=date(2015, 12, 1), disableddays=lambda d: d.day == 25)
+        widget.delete(0, "end")
+        widget.insert(0, format_date(date(2015, 12, 25), 'short'))
+        self.assertFalse(widget._validate_date())
+        self.assertEqual(widget.get_date(), date(2015, 12, 31))
+        widget.delete(0, "end")
+        widget.insert(0, format_date(date(2015, 11, 30), 'short'))
+        self.assertFalse(widget._validate_date())
+        self.assertEqual(widget.get_date(), date(2015, 12, 31))
+        widget.configure(mindate=None, disableddays=None)
+
         widget.state(("disabled",))
         self.window.update()
         self.assertIn("disabled", widget.state())
@@ -365,3 +1436,140 @@ class TestDateEntry(BaseWidgetTest):
         self.window.update()
         widget._select()
         self.assertIn('readonly', widget.state())
+
+    def test_dateentry_date_bounds(self):
+        with self.assertRaises(ValueError):
+            DateEntry(self.window, mindate='2018-01-01')
+        with self.assertRaises(ValueError):
+            DateEntry(self.window, mindate=date(2018, 3, 1), maxdate=date(2018, 2, 1))
+        with self.assertRaises(ValueError):
+            DateEntry(self.window, disableddays=True)
+        # two entries with disjoint ranges share the drop-down calendar
+        widget1 = DateEntry(self.window, maxdate=date(2018, 6, 30))
+        widget2 = DateEntry(self.window, mindate=datetime(2018, 7, 1, 12))
+        widget1.pack()
+        widget2.pack()
+        self.window.update()
+        self.assertEqual(widget1.get_date(), date(2018, 6, 30))
+        self.assertEqual(widget2['mindate'], date(2018, 7, 1))
+        widget1.drop_down()
+        self.window.update()
+        widget2.drop_down()
+        self.window.update()
+        dropdown = widget2._get_dropdown()
+        self.assertIs(dropdown.owner, widget2)
+        self.assertEqual(dropdown.calendar['mindate'], date(2018, 7, 1))
+        self.assertIsNone(dropdown.calendar['maxdate'])
+        widget1.drop_down()
+        self.window.update()
+        self.assertIs(dropdown.owner, widget1)
+        self.assertEqual(dropdown.calendar['maxdate'], date(2018, 6, 30))
+        self.assertIsNone(dropdown.calendar['mindate'])
+        widget1.drop_down()
+
+        widget2.configure(maxdate=date(2018, 12, 31))
+        with self.assertRaises(ValueError):
+            widget2.configure(maxdate=date(2018, 1, 1))
+        with self.assertRaises(ValueError):
+            widget2.configure(maxdate='2018-12-31')
+        with self.assertRaises(ValueError):
+            widget2.configure(disableddays=1)
+        self.assertEqual(widget2['maxdate'], date(2018, 12, 31))
+        widget2.configure(maxdate=date(2018, 3, 1), mindate=date(2018, 1, 1))
+        self.assertEqual(widget2._get_date_bounds(), (date(2018, 1, 1), date(2018, 3, 1)))
+
+    def test_dateentry_instrumentation(self):
+        widget = DateEntry(self.window, year=2018, month=12, day=5)
+        widget.pack()
+        self.window.update()
+        widget.instrumentation_enable()
+        self.assertEqual(widget.get_date(), date(2018, 12, 5))
+        widget.drop_down()
+        self.window.update()
+        widget.drop_down()
+        stats = widget.instrumentation_get()
+        self.assertEqual(stats['timings']['drop_down']['count'], 2)
+        # the entry content was written by the widget, it is not parsed
+        self.assertNotIn('parse_date', stats['timings'])
+        widget.delete(0, 'end')
+        widget.insert(0, format_date(date(2018, 12, 24), 'short'))
+        self.assertEqual(widget.get_date(), date(2018, 12, 24))
+        self.assertEqual(widget.get_date(), date(2018, 12, 24))
+        stats = widget.instrumentation_get()
+        self.assertEqual(stats['timings']['parse_date']['count'], 1)
+        widget.instrumentation_enable(False)
+        self.assertIs(widget.tk, self.window.tk)
+
+    def test_dateentry_motion(self):
+        widget = DateEntry(self.window)
+        widget.pack()
+        self.window.update()
+        x0, y0, x1, y1 = widget._get_downarrow_bbox()
+        name = widget.identify((x0 + x1) // 2, (y0 + y1) // 2)
+        self.assertTrue(name.endswith('downarrow'))
+        self.assertNotEqual(widget.identify(x0 - 1, (y0 + y1) // 2), name)
+        widget.instrumentation_enable()
+        widget._on_motion(TestEvent(x=x0, y=y0))
+        self.assertIn('active', widget.state())
+        self.assertEqual(str(widget.cget('cursor')), 'arrow')
+        widget.instrumentation_reset()
+        # no Tk call while the pointer stays over the arrow or the field
+        widget._on_motion(TestEvent(x=x1 - 1, y=y1 - 1))
+        self.assertEqual(widget.instrumentation_get()['calls'], {})
+        widget._on_motion(TestEvent(x=x0 - 1, y=y0))
+        self.assertNotIn('active', widget.state())
+        self.assertEqual(str(widget.cget('cursor')), 'xterm')
+        widget.instrumentation_reset()
+        widget._on_motion(TestEvent(x=1, y=y0))
+        self.assertEqual(widget.instrumentation_get()['calls'], {})
+        widget.instrumentation_enable(False)
+
+        widget.configure(style='my.TEntry')
+        self.window.update()
+        self.assertEqual(widget._get_downarrow_bbox(), ())
+        self.assertFalse(widget._is_on_downarrow(x0, y0))
+
+    def test_dateentry_idle(self):
+        pending = set(self.window.tk.splitlist(self.window.tk.call('after', 'info')))
+        notebook = ttk.Notebook(self.window)
+        notebook.pack()
+        tabs = [ttk.Frame(notebook) for i in range(2)]
+        for tab in tabs:
+            notebook.add(tab)
+        for tab in tabs:
+            for i in range(10):
+                DateEntry(tab).pack()
+        self.window.update()
+        notebook.select(1)
+        self.window.update()
+        # no timer is running when nothing happens, even for the entries
+        # of the unmapped tab
+        after = set(self.window.tk.splitlist(self.window.tk.call('after', 'info')))
+        self.assertEqual(after - pending, set())
+
+    def test_theme_change(self):
+        style = ttk.Style(self.window)
+        theme = style.theme_use()
+        calendars = [Calendar(self.window), Calendar(self.window, background='red')]
+        entries = [DateEntry(self.window), DateEntry(self.window)]
+        for widget in calendars + entries:
+            widget.pack()
+        self.window.update()
+        pending = set(self.window.tk.splitlist(self.window.tk.call('after', 'info')))
+        for widget in calendars + entries:
+            widget.instrumentation_enable()
+        try:
+            style.theme_use('clam' if theme == 'alt' else 'alt')
+            self.window.update()
+            stats = [widget.instrumentation_get() for widget in calendars + entries]
+            for stat in stats:
+                self.assertEqual(stat['timings']['_setup_style']['count'], 1)
+            # the values depending only on the theme are computed once
+            self.assertEqual(sum(stat['calls'].get('ttk::style lookup', 0) for stat in stats), 1)
+            self.assertEqual(sum(stat['calls'].get('ttk::style layout', 0) for stat in stats[2:]), 2)
+            after = set(self.window.tk.splitlist(self.window.tk.call('after', 'info')))
+            self.assertEqual(after - pending, set())
+        finally:
+            style.theme_use(theme)
+            for widget in calendars + entries:
+                widget.instrumentation_enable(False)
@@ -22,12 +22,15 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 tkcalendar module providing Calendar and DateEntry widgets
 """
-# TODO: custom first week day?
 
 
 import calendar
-from babel.dates import format_date, parse_date, get_day_names, get_month_names
+import re
+from itertools import count
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
 from sys import platform
+import time
 try:
     import tkinter as tk
     from tkinter import ttk
@@ -39,12 +42,1083 @@ except ImportError:
 from locale import getdefaultlocale
 
 
-class Calendar(ttk.Frame):
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+try:
+    _timer = time.perf_counter
+except AttributeError:
+    _timer = time.time
+
+try:
+    _string_types = basestring  # Babel and Tk return unicode in Python 2
+except NameError:
+    _string_types = str
+
+
+class _LRUCache(object):
+    """Size-bounded mapping discarding the least recently used items."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        """Return the value for key if key is in the cache, else default."""
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._data.pop(key, None)
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def cache_info(self):
+        """Return the cache statistics."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def cache_clear(self):
+        """Clear the cache and its statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class _MonthGrid(tuple):
+    """
+    6x7 grid of the days displayed for a month.
+
+    Each cell is a (date, other_month, weekend) tuple, other_month being True
+    for the days of the previous/next month. The days attribute is the tuple
+    of the 42 dates, row by row, index maps each date to its (row, column)
+    and week_numbers is the tuple of the ISO week numbers (str) of the rows.
+    """
+
+
+# 6x7 grids of displayed days shared by all calendars
+_month_grid_cache = _LRUCache(maxsize=256)
+
+
+def _get_month_grid(year, month, firstweekday):
+    """
+    Return the 6x7 grid (_MonthGrid) of the days displayed for the given month.
+
+    The grids are cached and shared by all the calendars so they are tuples
+    and must not be modified.
+    """
+    key = (year, month, firstweekday)
+    grid = _month_grid_cache.get(key)
+    if grid is None:
+        first = calendar.datetime.date(year, month, 1)
+        start = first.toordinal() - (first.weekday() - firstweekday) % 7
+        fromordinal = calendar.datetime.date.fromordinal
+        days = tuple(fromordinal(start + i) for i in range(42))
+        grid = _MonthGrid(tuple((day, day.month != month, day.weekday() > 4)
+                                for day in days[7 * i_week:7 * i_week + 7])
+                          for i_week in range(6))
+        grid.days = days
+        grid.index = dict((day, divmod(i, 7)) for i, day in enumerate(days))
+        # the ISO week of a row is the one of its thursday, which holds
+        # the majority of its days whatever the first day of the week
+        thursday = (calendar.THURSDAY - firstweekday) % 7
+        grid.week_numbers = tuple(str(days[7 * i_week + thursday].isocalendar()[1])
+                                  for i_week in range(6))
+        _month_grid_cache[key] = grid
+    return grid
+
+
+def _is_disabled_day(day, mindate, maxdate, predicate):
+    """Return True if day is before mindate, after maxdate or rejected by predicate."""
+    return ((mindate is not None and day < mindate) or
+            (maxdate is not None and day > maxdate) or
+            (predicate is not None and bool(predicate(day))))
+
+
+def month_grid_cache_info():
+    """Return the hits, misses, maxsize and currsize of the month grid cache."""
+    return _month_grid_cache.cache_info()
+
+
+MonthView = namedtuple('MonthView', ['grid', 'week_numbers', 'styles', 'selection', 'disabled'])
+
+
+class CalendarModel(object):
+    """
+    Displayed month, selection, disabled days and events of a Calendar, without Tk.
+
+    The model computes what a Calendar displays as plain data (see get_view),
+    the widget only applies the differences to its labels or canvas items.
+    It can therefore be used without a display, e.g. in tests, benchmarks or
+    to precompute month views in other threads.
+    """
+
+    timedelta = calendar.datetime.timedelta
+
+    def __init__(self, year, month, firstweekday=calendar.MONDAY, selectmode='day',
+                 mindate=None, maxdate=None, disableddays=None):
+        """
+        Create the model of a calendar displaying the given month.
+
+        See Calendar for the meaning of the options.
+        """
+        self.firstweekday = firstweekday
+        self.selectmode = selectmode
+        self.mindate = mindate
+        self.maxdate = maxdate
+        self.disableddays = disableddays
+        # {first displayed day: frozenset of the disabled displayed days}
+        self._disabled_days_cache = _LRUCache(maxsize=64)
+        self.date = self.clamp_month(calendar.datetime.date(year, month, 1))  # displayed month
+        self.sel_date = None      # 'day' selection
+        self.sel_range = None     # 'range' selection: (start, end)
+        self.range_anchor = None  # first end of the range being selected
+        self.range_hover = None   # other end of the range being selected
+        self.sel_dates = set()    # 'multiple' selection
+        # keyboard cursor and whether it is previewed ('range' and 'multiple' modes)
+        self.key_date = None
+        self.key_preview = False
+        # calendar events
+        self.calevents = {}       # {event id: {'date': date, 'text': text, 'tags': [tags]}}
+        self.calevent_dates = {}  # {date: [event ids]}
+        self.tags = {}            # {tag: {'background': bg, 'foreground': fg, 'style': style key}}
+
+    # --- navigation
+    def clamp_month(self, date):
+        """Return the first day of the month of date, or of the closest month within the bounds."""
+        if self.mindate is not None and date < self.mindate:
+            date = self.mindate
+        elif self.maxdate is not None and date > self.maxdate:
+            date = self.maxdate
+        return date.replace(day=1)
+
+    def next_month_date(self):
+        """Return the first day of the month following the displayed one."""
+        year, month = self.date.year, self.date.month
+        return self.date + self.timedelta(days=calendar.monthrange(year, month)[1])
+
+    def get_navigation_state(self):
+        """Return whether the previous and the next months are within the bounds."""
+        return ((self.mindate is None or self.date > self.mindate),
+                (self.maxdate is None or self.next_month_date() <= self.maxdate))
+
+    def see(self, date):
+        """Display the month of date, return True if the displayed month changed."""
+        date = date.replace(day=1)
+        if date == self.date:
+            return False
+        self.date = date
+        return True
+
+    def next_month(self):
+        """Display the next month if it is within the bounds, return True if it is."""
+        date = self.next_month_date()
+        if self.maxdate is not None and date > self.maxdate:
+            return False
+        self.date = date
+        return True
+
+    def prev_month(self):
+        """Display the previous month if it is within the bounds, return True if it is."""
+        if self.mindate is not None and self.date <= self.mindate:
+            return False
+        self.date = (self.date - self.timedelta(days=1)).replace(day=1)
+        return True
+
+    def next_year(self):
+        """Display the next year (or the last month within the bounds)."""
+        return self.see(self.clamp_month(self.date.replace(year=self.date.year + 1)))
+
+    def prev_year(self):
+        """Display the previous year (or the first month within the bounds)."""
+        return self.see(self.clamp_month(self.date.replace(year=self.date.year - 1)))
+
+    # --- display
+    def get_grid(self):
+        """Return the grid (_MonthGrid) of the displayed month."""
+        return _get_month_grid(self.date.year, self.date.month, self.firstweekday)
+
+    def get_disabled_days(self, grid):
+        """Return the frozenset of the disabled days of grid, cached per month."""
+        mindate, maxdate, predicate = self.mindate, self.maxdate, self.disableddays
+        if mindate is None and maxdate is None and predicate is None:
+            return frozenset()
+        days = grid.days
+        disabled = self._disabled_days_cache.get(days[0])
+        if disabled is None:
+            disabled = frozenset(day for day in days
+                                 if _is_disabled_day(day, mindate, maxdate, predicate))
+            self._disabled_days_cache[days[0]] = disabled
+        return disabled
+
+    def invalidate_disabled_days(self):
+        """Clear the cached results of the disableddays function."""
+        self._disabled_days_cache.cache_clear()
+
+    def get_cell_style(self, cell, disabled):
+        """Return the unselected style key of the (date, other_month, weekend) grid cell."""
+        day, other_month, weekend = cell
+        if day in disabled:
+            return 'disabled'
+        ev_ids = self.calevent_dates.get(day)
+        if ev_ids:
+            # the first tag of the last created event gives the style
+            for ev_id in reversed(ev_ids):
+                tags = self.calevents[ev_id]['tags']
+                if tags:
+                    return self.tags[tags[0]]['style']
+        style = 'we' if weekend else 'normal'
+        if other_month:
+            style += '_om'
+        return style
+
+    def get_selected_cells(self, grid):
+        """
+        Return the positions of the selected days of grid, disabled or not.
+
+        The keyboard cursor is previewed as the day that Return would select.
+        """
+        if self.selectmode == 'range':
+            if self.range_anchor is not None:
+                # preview of the range being selected
+                sel_range = sorted((self.range_anchor, self.range_hover))
+            elif self.key_preview:
+                sel_range = (self.key_date, self.key_date)
+            elif self.sel_range is not None:
+                sel_range = self.sel_range
+            else:
+                return set()
+            start = grid.days[0].toordinal()
+            first = max(sel_range[0].toordinal() - start, 0)
+            last = min(sel_range[1].toordinal() - start, 41)
+            return set(divmod(i, 7) for i in range(first, last + 1))
+        elif self.selectmode == 'multiple':
+            sel_dates = self.sel_dates
+            if self.key_preview:
+                # the cursor day is shown toggled
+                sel_dates = sel_dates ^ set([self.key_date])
+            return set(divmod(i, 7) for i, day in enumerate(grid.days) if day in sel_dates)
+        elif self.selectmode == 'day':
+            cell = grid.index.get(self.sel_date)
+            return set() if cell is None else set([cell])
+        return set()
+
+    def get_selection_cells(self, grid, disabled):
+        """Return the set of the (i_week, i_day) positions of the highlighted days of grid."""
+        cells = self.get_selected_cells(grid)
+        if disabled:
+            days = grid.days
+            return set((w, d) for w, d in cells if days[7 * w + d] not in disabled)
+        return cells
+
+    def get_view(self):
+        """
+        Return the MonthView of the displayed month.
+
+        It gives the grid, the week numbers of its rows, the style key of
+        each day ('sel' for the highlighted ones), the set of the positions
+        of the highlighted days and the frozenset of the disabled days.
+        """
+        grid = self.get_grid()
+        disabled = self.get_disabled_days(grid)
+        selection = self.get_selection_cells(grid, disabled)
+        styles = tuple(tuple('sel' if (i_week, i_day) in selection
+                             else self.get_cell_style(cell, disabled)
+                             for i_day, cell in enumerate(week))
+                       for i_week, week in enumerate(grid))
+        return MonthView(grid, grid.week_numbers, styles, selection, disabled)
+
+    # --- selection
+    def select(self, date):
+        """
+        Select date like a click on it would.
+
+        Return False if the selection is not complete yet (first end of a
+        range), True otherwise.
+        """
+        self.key_date = date
+        self.key_preview = False
+        if self.selectmode == 'range':
+            if self.range_anchor is None:
+                # first end of the range, wait for the second one
+                self.range_anchor = self.range_hover = date
+                self.sel_range = None
+                return False
+            self.sel_range = tuple(sorted((self.range_anchor, date)))
+            self.range_anchor = self.range_hover = None
+        elif self.selectmode == 'multiple':
+            if date in self.sel_dates:
+                self.sel_dates.remove(date)
+            else:
+                self.sel_dates.add(date)
+        else:
+            self.sel_date = date
+        return True
+
+    def get_key_date(self):
+        """Return the day of the keyboard cursor, None if it is not in the displayed month."""
+        if self.selectmode == 'day':
+            date = self.sel_date
+        elif self.selectmode == 'range' and self.range_anchor is not None:
+            date = self.range_hover
+        elif self.selectmode == 'range' and self.key_date is None and self.sel_range is not None:
+            date = self.sel_range[1]
+        else:
+            date = self.key_date
+        if date is None or date.replace(day=1) != self.date:
+            return None
+        return date
+
+    def find_enabled_day(self, date, step):
+        """Return the first day from date which is not disabled, going step days at a time."""
+        mindate, maxdate, predicate = self.mindate, self.maxdate, self.disableddays
+        if mindate is not None and date < mindate:
+            date, step = mindate, 1
+        elif maxdate is not None and date > maxdate:
+            date, step = maxdate, -1
+        delta = self.timedelta(days=step)
+        try:
+            for i in range(366):
+                if not _is_disabled_day(date, mindate, maxdate, predicate):
+                    return date
+                if (mindate is not None and date < mindate) or (maxdate is not None and date > maxdate):
+                    return None
+                date += delta
+        except OverflowError:
+            pass
+        return None
+
+    def get_key_target(self, days=0, months=0, edge=None):
+        """
+        Return the day where the keyboard cursor moves, None if it cannot move.
+
+        The cursor moves by days or months, or to the first/last day of its
+        month if edge is 'home'/'end'. Disabled days are skipped.
+        """
+        date = self.get_key_date()
+        step = -1 if (days < 0 or months < 0 or edge == 'end') else 1
+        try:
+            if date is None:
+                # start from the displayed month
+                target = self.date
+            elif edge == 'home':
+                target = date.replace(day=1)
+            elif edge == 'end':
+                target = date.replace(day=calendar.monthrange(date.year, date.month)[1])
+            elif months:
+                year, month = divmod(date.month - 1 + months, 12)
+                year += date.year
+                day = min(date.day, calendar.monthrange(year, month + 1)[1])
+                target = date.replace(year=year, month=month + 1, day=day)
+            else:
+                target = date + self.timedelta(days=days)
+        except (ValueError, OverflowError):
+            # beyond datetime.MINYEAR/MAXYEAR
+            return None
+        return self.find_enabled_day(target, step)
+
+    def move_key(self, target):
+        """
+        Move the keyboard cursor to target.
+
+        In 'day' mode the cursor is the selection, in 'range' mode it is the
+        end of the range being selected, if any.
+        """
+        self.key_date = target
+        self.see(target)
+        if self.selectmode == 'day':
+            self.sel_date = target
+        elif self.selectmode == 'range' and self.range_anchor is not None:
+            self.range_hover = target
+        else:
+            self.key_preview = True
+
+
+# ISO-8601 dates, tried first by babel.dates.parse_date
+_ISO_DATE_RE = re.compile(r'^([0-9]{4})-?([01][0-9])-?([0-3][0-9])$')
+
+
+def _compile_date_pattern(pattern):
+    """
+    Return a regex matching the dates written with the numeric date pattern.
+
+    Return None if the pattern contains other fields than the year, month
+    and day numbers or if they are not separated by literals.
+    """
+    from babel.dates import tokenize_pattern
+
+    regex = []
+    nb_fields = 0
+    after_field = False
+    for kind, value in tokenize_pattern(pattern.pattern):
+        if kind == 'field':
+            char, count = value
+            if char not in 'yMLd' or (char in 'ML' and count > 2) or after_field:
+                return None
+            regex.append(r'(\d+)')
+            nb_fields += 1
+            after_field = True
+        else:
+            if any(c.isdigit() for c in value):
+                return None
+            regex.append(re.escape(value))
+            after_field = False
+    if nb_fields != 3:
+        return None
+    return re.compile('^%s$' % ''.join(regex), re.UNICODE)
+
+
+def _compile_date_formatter(pattern):
+    """
+    Return a function writing datetime.date instances with the numeric date pattern.
+
+    The function gives the same result as pattern.apply(date, locale)
+    without going through babel for each date. Return None if the pattern
+    contains other fields than the year, month and day numbers.
+    """
+    from babel.dates import tokenize_pattern
+
+    template = []
+    fields = []  # indexes in (year, 2-digit year, month, day)
+    for kind, value in tokenize_pattern(pattern.pattern):
+        if kind == 'field':
+            char, count = value
+            if char == 'y':
+                fields.append(1 if count == 2 else 0)
+            elif char in 'ML' and count <= 2:
+                fields.append(2)
+            elif char == 'd' and count <= 2:
+                fields.append(3)
+            else:
+                return None
+            template.append('%%0%id' % count)
+        else:
+            template.append(value.replace('%', '%%'))
+    template = ''.join(template)
+    fields = tuple(fields)
+
+    def format_date(date):
+        values = (date.year, date.year % 100, date.month, date.day)
+        return template % tuple([values[i] for i in fields])
+
+    return format_date
+
+
+def _get_date_field_order(pattern):
+    """
+    Return the index of the year, month and day among the numbers of a date.
+
+    The order is deduced from pattern the same way babel.dates.parse_date does.
+    """
+    format_str = pattern.pattern.lower()
+    year_idx = format_str.index('y')
+    month_idx = format_str.find('m')
+    if month_idx < 0:
+        month_idx = format_str.index('l')
+    day_idx = format_str.index('d')
+    indexes = sorted([(year_idx, 'Y'), (month_idx, 'M'), (day_idx, 'D')])
+    indexes = {item[1]: idx for idx, item in enumerate(indexes)}
+    return indexes['Y'], indexes['M'], indexes['D']
+
+
+class _LocaleBundle(object):
+    """
+    Locale data used by the widgets: day and month names and short date pattern.
+
+    babel is only imported when the first bundle is created, to keep the
+    import of tkcalendar fast.
+    """
+
+    def __init__(self, locale):
+        from babel import Locale
+        from babel.dates import get_day_names, get_month_names, get_date_format, \
+            parse_date, LC_TIME
+
+        self._babel_parse_date = parse_date
+        self.locale = Locale.parse(locale or LC_TIME)
+        self.day_names = get_day_names('abbreviated', locale=self.locale)
+        self.month_names = get_month_names('wide', locale=self.locale)
+        self.first_week_day = self.locale.first_week_day
+        self.date_pattern = get_date_format('short', locale=self.locale)
+        # compiled formatter, None if the pattern is not purely numeric
+        self._format_date = _compile_date_formatter(self.date_pattern)
+        # compiled parser: regex matching short dates, the fields are
+        # interpreted like babel.dates.parse_date, which uses the medium
+        # date format as a hint
+        self._date_regex = _compile_date_pattern(self.date_pattern)
+        self._field_order = _get_date_field_order(get_date_format('medium', locale=self.locale))
+        self._parsed_dates = _LRUCache(maxsize=512)
+
+    def format_date(self, date=None):
+        """Convert date (datetime.date) to a string in the locale (short format)."""
+        if date is None:
+            date = calendar.datetime.date.today()
+        elif isinstance(date, calendar.datetime.datetime):
+            date = date.date()
+        if self._format_date is not None and isinstance(date, calendar.datetime.date):
+            return self._format_date(date)
+        return self.date_pattern.apply(date, self.locale)
+
+    def parse_date(self, date):
+        """Parse string date in the locale format and return the corresponding datetime.date."""
+        parsed = self._parsed_dates.get(date)
+        if parsed is None:
+            parsed = self._parse_date(date)
+            self._parsed_dates[date] = parsed
+        return parsed
+
+    def _parse_date(self, date):
+        """Parse date with the compiled regex, fall back to babel if it does not match."""
+        if self._date_regex is not None:
+            match = self._date_regex.match(date)
+            if match is not None and _ISO_DATE_RE.match(date) is None:
+                numbers = match.groups()
+                year_idx, month_idx, day_idx = self._field_order
+                year = numbers[year_idx]
+                year = 2000 + int(year) if len(year) == 2 else int(year)
+                month = int(numbers[month_idx])
+                day = int(numbers[day_idx])
+                if month > 12:
+                    month, day = day, month
+                return calendar.datetime.date(year, month, day)
+        return self._babel_parse_date(date, self.locale)
+
+
+_locale_bundles = {}
+_default_locale = []
+
+
+def _get_default_locale():
+    """Return the default locale identifier, only looked up once."""
+    if not _default_locale:
+        _default_locale.append(getdefaultlocale()[0])
+    return _default_locale[0]
+
+
+def _get_locale_bundle(locale):
+    """Return the cached locale data for the locale identifier."""
+    try:
+        return _locale_bundles[locale]
+    except KeyError:
+        bundle = _locale_bundles[locale] = _LocaleBundle(locale)
+        return bundle
+
+
+def preload_locales(locales):
+    """
+    Load the data of the given locales, e.g. ['en_US', 'fr_FR'].
+
+    This can be done at application startup so that creating the first
+    widgets with these locales is faster.
+    """
+    for locale in locales:
+        _get_locale_bundle(locale)
+
+
+def _to_dates_list(dates):
+    """
+    Return the list of the items of dates.
+
+    NumPy datetime64 arrays and scalars are converted to datetime.date
+    instances, NaT to None.
+    """
+    dtype = getattr(dates, 'dtype', None)
+    if dtype is not None and dtype.kind == 'M':
+        # whole array converted at once
+        return dates.astype('datetime64[D]').tolist()
+    result = []
+    for date in dates:
+        dtype = getattr(date, 'dtype', None)
+        if dtype is not None and dtype.kind == 'M':
+            date = date.astype('datetime64[D]').item()
+        result.append(date)
+    return result
+
+
+def format_dates(dates, locale=None):
+    """
+    Convert dates to strings in the locale short format, like Calendar.format_date.
+
+    dates is an iterable of datetime.date (or datetime.datetime) instances
+    or a NumPy datetime64 array. None and NaT give None. The locale defaults
+    to the one of the widgets. Return the list of the strings.
+    """
+    format_date = _get_locale_bundle(locale or _get_default_locale()).format_date
+    return [None if date is None else format_date(date) for date in _to_dates_list(dates)]
+
+
+def parse_dates(texts, locale=None):
+    """
+    Convert strings in the locale short format to dates, like Calendar.parse_date.
+
+    texts is an iterable of strings, None and empty strings give None. The
+    locale defaults to the one of the widgets. Return the list of the
+    datetime.date instances, raise ValueError if a string is not a valid date.
+    """
+    parse_date = _get_locale_bundle(locale or _get_default_locale()).parse_date
+    return [parse_date(text) if text else None for text in texts]
+
+
+def _find_layout_element(layout, suffix):
+    """Return the name of the first element of the ttk layout ending with suffix, or None."""
+    for element, options in layout:
+        if element.endswith(suffix):
+            return element
+        name = _find_layout_element((options or {}).get('children', []), suffix)
+        if name is not None:
+            return name
+    return None
+
+
+def _get_root_registry(widget, name, factory):
+    """
+    Return the registry called name shared by the widgets of the same Tk root.
+
+    The registry is created with factory() the first time and is discarded
+    with the root.
+    """
+    registries = widget._root().__dict__.setdefault('_tkcalendar_registries', {})
+    try:
+        return registries[name]
+    except KeyError:
+        registry = registries[name] = factory()
+        return registry
+
+
+class _StyleRegistry(object):
+    """
+    Reference-counted ttk style sets shared by the calendars of a Tk root.
+
+    Calendars with the same colors use the same set of styles, named with a
+    common prefix, e.g. 'normal.<prefix>.TLabel'. The prefixes of the released
+    sets are recycled so that the number of styles stays bounded.
+    """
+
+    def __init__(self):
+        self._prefixes = {}  # {signature: prefix}
+        self._sets = {}      # {prefix: [signature, reference count, theme]}
+        self._free = []
+        self._count = 0
+        self._moves = OrderedDict()  # {calendar: changed options}, see request_move
+
+    def __len__(self):
+        return len(self._sets)
+
+    def acquire(self, signature, theme):
+        """
+        Return the prefix of the style set matching signature.
+
+        Also return True if the styles need to be configured, i.e. if the
+        set is new or was configured for another theme.
+        """
+        prefix = self._prefixes.get(signature)
+        if prefix is None:
+            if self._free:
+                prefix = self._free.pop()
+            else:
+                self._count += 1
+                prefix = 'tkcalendar%i' % self._count
+            self._prefixes[signature] = prefix
+            self._sets[prefix] = [signature, 1, theme]
+            return prefix, True
+        style_set = self._sets[prefix]
+        style_set[1] += 1
+        configure = style_set[2] != theme
+        style_set[2] = theme
+        return prefix, configure
+
+    def rename(self, prefix, signature, theme, holders=1):
+        """
+        Change the signature of the style set so that its styles can be modified in place.
+
+        This is only possible if the set is used by holders calendars only,
+        was configured for theme and if there is no set matching signature
+        yet. Return True on success.
+        """
+        style_set = self._sets[prefix]
+        if style_set[1] != holders or style_set[2] != theme or signature in self._prefixes:
+            return False
+        del self._prefixes[style_set[0]]
+        self._prefixes[signature] = prefix
+        style_set[0] = signature
+        return True
+
+    def is_shared(self, prefix):
+        """Return True if the style set is used by several calendars."""
+        return self._sets[prefix][1] > 1
+
+    def request_move(self, widget, options):
+        """
+        Record that the style options of the calendar widget changed while its set is shared.
+
+        The moves are applied together with pop_moves so that a set whose
+        calendars all change to the same colors is modified in place.
+        """
+        changed = self._moves.setdefault(widget, [])
+        changed.extend(option for option in options if option not in changed)
+
+    def cancel_move(self, widget):
+        self._moves.pop(widget, None)
+
+    def pop_moves(self):
+        """Return and forget the pending moves, {calendar: changed options}."""
+        moves = self._moves
+        self._moves = OrderedDict()
+        return moves
+
+    def release(self, prefix):
+        """Release the style set, it is recycled when no longer used."""
+        style_set = self._sets[prefix]
+        style_set[1] -= 1
+        if style_set[1] == 0:
+            del self._prefixes[style_set[0]]
+            del self._sets[prefix]
+            self._free.append(prefix)
+
+
+class _ThemeCoordinator(object):
+    """
+    Propagate the ttk theme changes to the tkcalendar widgets of a Tk root.
+
+    <<ThemeChanged>> is received once, by a hidden frame, instead of by each
+    widget. The widgets are then updated by batches in idle callbacks so that
+    the application stays responsive, and the values which only depend on the
+    theme are computed once per change, see cached().
+    """
+
+    batch_size = 50
+
+    def __init__(self, root):
+        self._root = root
+        self._frame = None
+        self._widgets = OrderedDict()  # {widget path: widget}
+        self._pending = []             # paths of the widgets to update
+        self._values = None            # {key: value} during an update
+        self._after_id = None
+
+    def register(self, widget):
+        """Call widget._on_theme_change() after each theme change."""
+        if self._frame is None or not self._frame.winfo_exists():
+            # never displayed, only used to receive <<ThemeChanged>> once
+            self._frame = tk.Frame(self._root)
+            self._frame.bind('<<ThemeChanged>>', self._on_theme_change)
+            self._after_id = None
+        self._widgets[str(widget)] = widget
+
+    def unregister(self, widget):
+        self._widgets.pop(str(widget), None)
+
+    def cached(self, key, func):
+        """
+        Return func().
+
+        During the update of the widgets after a theme change, the result is
+        computed once and shared by all the widgets using the same key.
+        """
+        if self._values is None:
+            return func()
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = func()
+            return value
+
+    def _on_theme_change(self, event):
+        if self._after_id is not None:
+            self._frame.after_cancel(self._after_id)
+        self._values = {}
+        self._pending = list(self._widgets)
+        self._after_id = self._frame.after_idle(self._update)
+
+    def _update(self):
+        """Update the next batch of widgets."""
+        batch = self._pending[:self.batch_size]
+        del self._pending[:self.batch_size]
+        for path in batch:
+            widget = self._widgets.get(path)
+            if widget is not None:
+                widget._on_theme_change()
+        if self._pending:
+            self._after_id = self._frame.after_idle(self._update)
+        else:
+            self._after_id = None
+            self._values = None
+
+
+def _get_theme_coordinator(widget):
+    """Return the theme coordinator of the Tk root of widget."""
+    root = widget._root()
+    return _get_root_registry(widget, 'theme', lambda: _ThemeCoordinator(root))
+
+
+# style keys of the calendar event tags, unique among all the calendars
+# so that calendars sharing a style set do not conflict
+_tag_style_ids = count(1)
+
+
+class _Instrumentation(object):
+    """Counters of the Tk commands, virtual events and timed method calls of a widget."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = {}    # {Tk command: count}
+        self.events = {}   # {virtual event: count}
+        self.timings = {}  # {method: [count, total time]}
+
+    def get(self):
+        return {'calls': dict(self.calls),
+                'events': dict(self.events),
+                'timings': dict((name, {'count': count, 'time': total})
+                                for name, (count, total) in self.timings.items())}
+
+    def count_call(self, cmd):
+        name = str(cmd[0])
+        sub = str(cmd[1]) if len(cmd) > 1 else ''
+        if name.startswith('.'):
+            key = sub  # widget command, e.g. 'configure'
+        else:
+            key = ('%s %s' % (name, sub)).strip()  # e.g. 'ttk::style map'
+        self.calls[key] = self.calls.get(key, 0) + 1
+        if key == 'event generate' and len(cmd) > 3:
+            event = str(cmd[3])
+            self.events[event] = self.events.get(event, 0) + 1
+
+    def wrap(self, name, func):
+        """Return a wrapper of func recording its call count and wall time."""
+        def wrapper(*args, **kw):
+            t0 = _timer()
+            try:
+                return func(*args, **kw)
+            finally:
+                timing = self.timings.setdefault(name, [0, 0.])
+                timing[0] += 1
+                timing[1] += _timer() - t0
+        return wrapper
+
+
+class _TkCallCounter(object):
+    """Proxy of a Tcl interpreter counting the commands called through it."""
+
+    def __init__(self, tk, instrumentation):
+        self._tk = tk
+        self._instrumentation = instrumentation
+
+    def __getattr__(self, name):
+        return getattr(self._tk, name)
+
+    def call(self, *args):
+        if len(args) == 1 and isinstance(args[0], tuple):
+            self._instrumentation.count_call(args[0])
+        else:
+            self._instrumentation.count_call(args)
+        return self._tk.call(*args)
+
+
+class _InstrumentationMixin(object):
+    """
+    Opt-in instrumentation of a widget.
+
+    When enabled, the Tcl interpreter of the widget, its descendants and its
+    style is replaced by a counting proxy and the methods listed in
+    _instrumented_methods are shadowed by timing wrappers. Disabling removes
+    them so that there is no overhead at all when the instrumentation is off.
+    """
+
+    _instrumented_methods = ()
+    _instrumentation = None
+    _instrumentation_enabled = False
+
+    def _instrumented_objects(self):
+        objects = [self.style]
+        widgets = [self]
+        while widgets:
+            widget = widgets.pop()
+            objects.append(widget)
+            widgets.extend(widget.children.values())
+        return objects
+
+    def instrumentation_enable(self, enable=True):
+        """
+        Enable or disable the instrumentation of the widget.
+
+        The counters are kept when the instrumentation is disabled, use
+        instrumentation_reset to clear them.
+        """
+        enable = bool(enable)
+        if enable == self._instrumentation_enabled:
+            return
+        if enable:
+            if self._instrumentation is None:
+                self._instrumentation = _Instrumentation()
+            proxy = _TkCallCounter(self.tk, self._instrumentation)
+            for obj in self._instrumented_objects():
+                obj.tk = proxy
+            for name in self._instrumented_methods:
+                setattr(self, name, self._instrumentation.wrap(name, getattr(self, name)))
+        else:
+            interp = self.tk._tk
+            for obj in self._instrumented_objects():
+                if isinstance(obj.tk, _TkCallCounter):
+                    obj.tk = interp
+            for name in self._instrumented_methods:
+                del self.__dict__[name]
+        self._instrumentation_enabled = enable
+
+    def instrumentation_get(self):
+        """
+        Return the instrumentation counters.
+
+        The result is a dictionary with the keys:
+
+            * 'calls': number of calls of each Tk command, e.g. 'configure'
+              for a widget or 'ttk::style configure'
+            * 'events': number of generated events, e.g. '<<CalendarSelected>>'
+            * 'timings': {method: {'count': number of calls, 'time': total wall time in seconds}}
+        """
+        if self._instrumentation is None:
+            return _Instrumentation().get()
+        return self._instrumentation.get()
+
+    def instrumentation_reset(self):
+        """Reset the instrumentation counters."""
+        if self._instrumentation is not None:
+            self._instrumentation.reset()
+
+
+def _model_attribute(name):
+    """Return a property giving access to the attribute name of the calendar model."""
+    return property(lambda self: getattr(self._model, name),
+                    lambda self, value: setattr(self._model, name, value))
+
+
+class Calendar(_InstrumentationMixin, ttk.Frame):
     """Calendar widget."""
     date = calendar.datetime.date
+    datetime = calendar.datetime.datetime
     timedelta = calendar.datetime.timedelta
     strptime = calendar.datetime.datetime.strptime
     strftime = calendar.datetime.datetime.strftime
+    # resource names
+    _options = ['cursor',
+                'font',
+                'borderwidth',
+                'state',
+                'selectmode',
+                'textvariable',
+                'locale',
+                'showweeknumbers',
+                'firstweekday',
+                'engine',
+                'mindate',
+                'maxdate',
+                'disableddays',
+                'selectbackground',
+                'selectforeground',
+                'disabledselectbackground',
+                'disabledselectforeground',
+                'normalbackground',
+                'normalforeground',
+                'background',
+                'foreground',
+                'bordercolor',
+                'othermonthforeground',
+                'othermonthbackground',
+                'othermonthweforeground',
+                'othermonthwebackground',
+                'weekendbackground',
+                'weekendforeground',
+                'headersbackground',
+                'headersforeground',
+                'disableddaybackground',
+                'disableddayforeground']
+    # (background, foreground) options of each day style
+    _style_colors = {'normal': ('normalbackground', 'normalforeground'),
+                     'we': ('weekendbackground', 'weekendforeground'),
+                     'disabled': ('disableddaybackground', 'disableddayforeground'),
+                     'normal_om': ('othermonthbackground', 'othermonthforeground'),
+                     'we_om': ('othermonthwebackground', 'othermonthweforeground'),
+                     'sel': ('selectbackground', 'selectforeground'),
+                     'headers': ('headersbackground', 'headersforeground')}
+    # options defining the ttk styles of the calendar
+    _style_options = ['background', 'foreground', 'bordercolor',
+                      'normalbackground', 'normalforeground',
+                      'weekendbackground', 'weekendforeground',
+                      'othermonthbackground', 'othermonthforeground',
+                      'othermonthwebackground', 'othermonthweforeground',
+                      'selectbackground', 'selectforeground',
+                      'headersbackground', 'headersforeground',
+                      'disabledselectbackground', 'disabledselectforeground',
+                      'disableddaybackground', 'disableddayforeground']
+    # ttk styles depending on each option: (style method, style, style option)
+    _style_table = {'background': [('configure', 'main.%s.TFrame', 'background'),
+                                   ('configure', 'main.%s.TLabel', 'background'),
+                                   ('configure', 'R.%s.TButton', 'background'),
+                                   ('configure', 'R.%s.TButton', 'bordercolor'),
+                                   ('configure', 'R.%s.TButton', 'lightcolor'),
+                                   ('configure', 'R.%s.TButton', 'darkcolor'),
+                                   ('configure', 'L.%s.TButton', 'background'),
+                                   ('configure', 'L.%s.TButton', 'bordercolor'),
+                                   ('configure', 'L.%s.TButton', 'lightcolor'),
+                                   ('configure', 'L.%s.TButton', 'darkcolor')],
+                    'foreground': [('configure', 'main.%s.TLabel', 'foreground'),
+                                   ('configure', 'R.%s.TButton', 'arrowcolor'),
+                                   ('configure', 'L.%s.TButton', 'arrowcolor')],
+                    'font': [('configure', 'R.%s.TButton', 'arrowsize'),
+                             ('configure', 'L.%s.TButton', 'arrowsize')],
+                    'bordercolor': [('configure', 'cal.%s.TFrame', 'background')],
+                    'normalbackground': [('configure', 'normal.%s.TLabel', 'background')],
+                    'normalforeground': [('configure', 'normal.%s.TLabel', 'foreground')],
+                    'weekendbackground': [('configure', 'we.%s.TLabel', 'background')],
+                    'weekendforeground': [('configure', 'we.%s.TLabel', 'foreground')],
+                    'othermonthbackground': [('configure', 'normal_om.%s.TLabel', 'background')],
+                    'othermonthforeground': [('configure', 'normal_om.%s.TLabel', 'foreground')],
+                    'othermonthwebackground': [('configure', 'we_om.%s.TLabel', 'background')],
+                    'othermonthweforeground': [('configure', 'we_om.%s.TLabel', 'foreground')],
+                    'selectbackground': [('configure', 'sel.%s.TLabel', 'background')],
+                    'selectforeground': [('configure', 'sel.%s.TLabel', 'foreground')],
+                    'headersbackground': [('configure', 'headers.%s.TLabel', 'background')],
+                    'headersforeground': [('configure', 'headers.%s.TLabel', 'foreground')],
+                    'disabledselectbackground': [('map', 'sel.%s.TLabel', 'background')],
+                    'disabledselectforeground': [('map', 'sel.%s.TLabel', 'foreground')],
+                    'disableddaybackground': [('map', '%s.TLabel', 'background'),
+                                              ('configure', 'disabled.%s.TLabel', 'background')],
+                    'disableddayforeground': [('map', '%s.TLabel', 'foreground'),
+                                              ('configure', 'disabled.%s.TLabel', 'foreground')]}
+    _instrumented_methods = ('_display_calendar', '_display_selection', '_setup_style',
+                             'format_date', 'parse_date')
+
+    # state held by the CalendarModel
+    _date = _model_attribute('date')  # (year, month) displayed by the calendar
+    _sel_date = _model_attribute('sel_date')
+    _sel_range = _model_attribute('sel_range')
+    _range_anchor = _model_attribute('range_anchor')
+    _range_hover = _model_attribute('range_hover')
+    _sel_dates = _model_attribute('sel_dates')
+    _key_date = _model_attribute('key_date')
+    _key_preview = _model_attribute('key_preview')
+
+    # options requiring a redraw of the canvas items colors (canvas engine)
+    _canvas_color_options = ['state', 'bordercolor',
+                             'normalbackground', 'normalforeground',
+                             'weekendbackground', 'weekendforeground',
+                             'othermonthbackground', 'othermonthforeground',
+                             'othermonthwebackground', 'othermonthweforeground',
+                             'selectbackground', 'selectforeground',
+                             'headersbackground', 'headersforeground',
+                             'disabledselectbackground', 'disabledselectforeground',
+                             'disableddaybackground', 'disableddayforeground']
 
     def __init__(self, master=None, **kw):
         """
@@ -60,9 +1134,23 @@ class Calendar(ttk.Frame):
             day: initially selected day, if month or year is given but not
                 day, no initial selection, otherwise, default is today
             locale: locale to use, e.g. 'fr_FR'
-            selectmode: "none" or "day" (default) define whether the user
-                        can change the selected day with a mouse click
+            selectmode: "none", "day" (default), "range" or "multiple" define
+                        whether the user can change the selected day with a
+                        mouse click, in "range" mode, two clicks select a
+                        range of days, in "multiple" mode, each click toggles
+                        the selection of a day
             showweeknumbers: boolean (default is True) to show/hide week numbers
+            firstweekday: first day of the week, from 0 (calendar.MONDAY)
+                          to 6 (calendar.SUNDAY), default is the locale's
+            engine: "label" (default) or "canvas", draw the calendar with one
+                    label per day or on a single canvas (fewer widgets)
+            mindate, maxdate: datetime.date, the days before mindate and
+                              after maxdate are disabled
+            disableddays: function taking a datetime.date and returning True
+                          if the day is disabled, the results are cached per
+                          displayed month, see invalidate_disabled_days
+                          (disabled days cannot be selected with the mouse
+                          and are displayed with the disabledday colors)
             textvariable: StringVar that will contain the currently selected date as str
             background: background color of calendar border and month/year name
             foreground: foreground color of month/year name
@@ -91,7 +1179,12 @@ class Calendar(ttk.Frame):
         VIRTUAL EVENTS
 
             A <<CalendarSelected>> event is generated each time the user
-            selects a day with the mouse.
+            selects a day with the mouse or the keyboard.
+
+        KEYBOARD NAVIGATION
+
+            Arrows, Page Up/Down and Home/End move the cursor (the selection
+            in "day" mode) and Return selects the day of the cursor.
         """
 
         curs = kw.pop("cursor", "")
@@ -99,8 +1192,6 @@ class Calendar(ttk.Frame):
         classname = kw.pop('class_', "Calendar")
         name = kw.pop('name', None)
         ttk.Frame.__init__(self, master, class_=classname, cursor=curs, name=name)
-        self._style_prefixe = str(self)
-        ttk.Frame.configure(self, style='main.%s.TFrame' % self._style_prefixe)
 
         self._textvariable = kw.pop("textvariable", None)
 
@@ -112,17 +1203,13 @@ class Calendar(ttk.Frame):
         # state
         state = kw.get('state', 'normal')
 
-        try:
-            bd = int(kw.pop('borderwidth', 2))
-        except ValueError:
-            raise ValueError('expected integer for the borderwidth option.')
-
-        self._cal = calendar.TextCalendar(calendar.MONDAY)
+        bd = self._check_borderwidth(kw.pop('borderwidth', 2))
 
         # --- locale
-        locale = kw.pop("locale", getdefaultlocale()[0])
-        self._day_names = get_day_names('abbreviated', locale=locale)
-        self._month_names = get_month_names('wide', locale=locale)
+        locale = kw.pop("locale", _get_default_locale())
+        self._locale_bundle = _get_locale_bundle(locale)
+        self._day_names = self._locale_bundle.day_names
+        self._month_names = self._locale_bundle.month_names
 
         # --- date
         today = self.date.today()
@@ -130,26 +1217,36 @@ class Calendar(ttk.Frame):
         if (("month" in kw) or ("year" in kw)) and ("day" not in kw):
             month = kw.pop("month", today.month)
             year = kw.pop('year', today.year)
-            self._sel_date = None  # selected day
+            sel_date = None  # selected day
         else:
             day = kw.pop('day', today.day)
             month = kw.pop("month", today.month)
             year = kw.pop('year', today.year)
             try:
-                self._sel_date = self.date(year, month, day)  # selected day
+                sel_date = self.date(year, month, day)  # selected day
                 if self._textvariable is not None:
-                    self._textvariable.set(format_date(self._sel_date, 'short', locale))
+                    self._textvariable.set(self._locale_bundle.format_date(sel_date))
             except ValueError:
-                self._sel_date = None
+                sel_date = None
 
-        self._date = self.date(year, month, 1)  # (year, month) displayed by the calendar
+        # --- disabled days
+        mindate, maxdate = self._check_date_bounds(kw.pop('mindate', None), kw.pop('maxdate', None))
+        disableddays = self._check_disableddays(kw.pop('disableddays', None))
+        self._disabled = frozenset()  # disabled days of the displayed month
+        self._arrows_shadow = None
 
         # --- selectmode
-        selectmode = kw.pop("selectmode", "day")
-        if selectmode not in ("none", "day"):
-            raise ValueError("'selectmode' option should be 'none' or 'day'.")
+        selectmode = self._check_selectmode(kw.pop("selectmode", "day"))
         # --- show week numbers
         showweeknumbers = kw.pop('showweeknumbers', True)
+        # --- first day of the week
+        firstweekday = kw.pop('firstweekday', None)
+        if firstweekday is None:
+            firstweekday = self._locale_bundle.first_week_day
+        else:
+            firstweekday = self._check_firstweekday(firstweekday)
+        # --- rendering engine
+        engine = self._check_engine(kw.pop('engine', 'label'))
 
         # --- style
         self.style = ttk.Style(self)
@@ -159,37 +1256,9 @@ class Calendar(ttk.Frame):
         dis_fg = self.style.lookup('TLabel', 'foreground', ('disabled',))
 
         # --- properties
-        options = ['cursor',
-                   'font',
-                   'borderwidth',
-                   'state',
-                   'selectmode',
-                   'textvariable',
-                   'locale',
-                   'showweeknumbers',
-                   'selectbackground',
-                   'selectforeground',
-                   'disabledselectbackground',
-                   'disabledselectforeground',
-                   'normalbackground',
-                   'normalforeground',
-                   'background',
-                   'foreground',
-                   'bordercolor',
-                   'othermonthforeground',
-                   'othermonthbackground',
-                   'othermonthweforeground',
-                   'othermonthwebackground',
-                   'weekendbackground',
-                   'weekendforeground',
-                   'headersbackground',
-                   'headersforeground',
-                   'disableddaybackground',
-                   'disableddayforeground']
-
         keys = list(kw.keys())
         for option in keys:
-            if option not in options:
+            if option not in self._options:
                 del(kw[option])
 
         self._properties = {"cursor": curs,
@@ -200,6 +1269,11 @@ class Calendar(ttk.Frame):
                             "selectmode": selectmode,
                             'textvariable': self._textvariable,
                             'showweeknumbers': showweeknumbers,
+                            'firstweekday': firstweekday,
+                            'engine': engine,
+                            'mindate': mindate,
+                            'maxdate': maxdate,
+                            'disableddays': disableddays,
                             'selectbackground': active_bg,
                             'selectforeground': 'white',
                             'disabledselectbackground': dis_active_bg,
@@ -221,6 +1295,27 @@ class Calendar(ttk.Frame):
                             'disableddayforeground': dis_fg}
         self._properties.update(kw)
 
+        # --- model: displayed month, selection, disabled days and events
+        self._model = CalendarModel(year, month, firstweekday, selectmode,
+                                    mindate, maxdate, disableddays)
+        self._model.sel_date = sel_date
+
+        # --- calendar events
+        self._calevents = self._model.calevents
+        self._calevent_dates = self._model.calevent_dates
+        self._calevent_count = 0
+        self._tags = self._model.tags
+        self._tag_styles = {}       # {style key: tag}
+        self._tag_styles_state = None  # (prefix, theme) for which the tag styles are configured
+
+        # --- shared styles
+        self._style_prefixe = None
+        self._style_registry = _get_root_registry(self, 'styles', _StyleRegistry)
+        self._theme_coordinator = _get_theme_coordinator(self)
+        self._theme_coordinator.register(self)
+        self._setup_style()
+        ttk.Frame.configure(self, style='main.%s.TFrame' % self._style_prefixe)
+
         # --- init calendar
         # --- *-- header: month - year
         header = ttk.Frame(self, style='main.%s.TFrame' % self._style_prefixe)
@@ -252,27 +1347,73 @@ class Calendar(ttk.Frame):
 
         f_month.pack(side='left', fill='x')
         f_year.pack(side='right')
+        self._header_frames = [header, f_month, f_year]
 
         # --- *-- calendar
+        # (text, style) currently displayed, to reconfigure only what changed
+        self._header_shadow = None
+        self._week_nbs_shadow = [None] * 6
+        self._cells_shadow = [[('', 'normal')] * 7 for i in range(6)]
+        self._sel_cells = set()  # positions of the highlighted days
+        self._writing_textvariable = False
+        # parts of the display to redraw at the next idle time
+        self._dirty = set()
+        self._render_after_id = None
+        if engine == 'canvas':
+            self._init_canvas()
+        else:
+            self._init_labels()
+
+        # --- *-- pack main elements
+        header.pack(fill="x", padx=2, pady=2)
+        if engine == 'canvas':
+            self._canvas.pack(fill="both", expand=True, padx=bd, pady=bd)
+        else:
+            self._cal_frame.pack(fill="both", expand=True, padx=bd, pady=bd)
+
+        self.config(state=state)
+
+        # --- bindings
+        for sequence, move in (('<Left>', {'days': -1}), ('<Right>', {'days': 1}),
+                               ('<Up>', {'days': -7}), ('<Down>', {'days': 7}),
+                               ('<Prior>', {'months': -1}), ('<Next>', {'months': 1}),
+                               ('<Home>', {'edge': 'home'}), ('<End>', {'edge': 'end'})):
+            self.bind(sequence, lambda e, move=move: self._key_move(**move))
+        self.bind('<Return>', self._on_return)
+        self.bind('<KP_Enter>', self._on_return)
+
+        self._display_calendar()
+
+        if self._textvariable is not None:
+            try:
+                self._textvariable_trace_id = self._textvariable.trace_add('write', self._textvariable_trace)
+            except AttributeError:
+                self._textvariable_trace_id = self._textvariable.trace('w', self._textvariable_trace)
+
+    def _init_labels(self):
+        """Create the day names, week numbers and days labels."""
         self._cal_frame = ttk.Frame(self,
                                     style='cal.%s.TFrame' % self._style_prefixe)
 
-        ttk.Label(self._cal_frame,
-                  style='headers.%s.TLabel' % self._style_prefixe).grid(row=0,
-                                                                        column=0,
-                                                                        sticky="eswn")
+        corner = ttk.Label(self._cal_frame,
+                           style='headers.%s.TLabel' % self._style_prefixe)
+        corner.grid(row=0, column=0, sticky="eswn")
+        self._headers = [corner]
 
+        firstweekday = self._properties['firstweekday']
         for i in range(7):
-            d = self._day_names[i]
+            d = self._day_names[(firstweekday + i) % 7]
             self._cal_frame.columnconfigure(i + 1, weight=1)
-            ttk.Label(self._cal_frame,
-                      font=self._font,
-                      style='headers.%s.TLabel' % self._style_prefixe,
-                      anchor="center",
-                      text=d, width=4).grid(row=0, column=i + 1,
-                                            sticky="ew", pady=(0, 1))
+            label = ttk.Label(self._cal_frame,
+                              font=self._font,
+                              style='headers.%s.TLabel' % self._style_prefixe,
+                              anchor="center",
+                              text=d, width=4)
+            label.grid(row=0, column=i + 1, sticky="ew", pady=(0, 1))
+            self._headers.append(label)
         self._week_nbs = []
         self._calendar = []
+        self._label_cells = {}  # {day label: (i_week, i_day)}
         for i in range(1, 7):
             self._cal_frame.rowconfigure(i, weight=1)
             wlabel = ttk.Label(self._cal_frame, style='headers.%s.TLabel' % self._style_prefixe,
@@ -280,34 +1421,133 @@ class Calendar(ttk.Frame):
                                anchor="e", width=2)
             self._week_nbs.append(wlabel)
             wlabel.grid(row=i, column=0, sticky="esnw", padx=(0, 1))
-            if not showweeknumbers:
+            if not self._properties['showweeknumbers']:
                 wlabel.grid_remove()
             self._calendar.append([])
             for j in range(1, 8):
                 label = ttk.Label(self._cal_frame, style='normal.%s.TLabel' % self._style_prefixe,
                                   font=self._font, anchor="center")
                 self._calendar[-1].append(label)
+                self._label_cells[label] = (i - 1, j - 1)
                 label.grid(row=i, column=j, padx=(0, 1), pady=(0, 1), sticky="nsew")
-                if selectmode is "day":
+                if self._properties['selectmode'] != "none":
                     label.bind("<1>", self._on_click)
-
-        # --- *-- pack main elements
-        header.pack(fill="x", padx=2, pady=2)
-        self._cal_frame.pack(fill="both", expand=True, padx=bd, pady=bd)
-
-        self.config(state=state)
-
-        # --- bindings
-        self.bind('<<ThemeChanged>>', self._setup_style)
-
-        self._setup_style()
-        self._display_calendar()
-
-        if self._textvariable is not None:
-            try:
-                self._textvariable_trace_id = self._textvariable.trace_add('write', self._textvariable_trace)
-            except AttributeError:
-                self._textvariable_trace_id = self._textvariable.trace('w', self._textvariable_trace)
+                if self._properties['selectmode'] == "range":
+                    label.bind("<Enter>", self._on_enter)
+
+    def _init_canvas(self):
+        """Draw the day names, week numbers and days on a single canvas."""
+        self._canvas = tk.Canvas(self, borderwidth=0, highlightthickness=0,
+                                 background=self._properties['bordercolor'])
+        create_rect = self._canvas.create_rectangle
+        create_text = self._canvas.create_text
+        # corner + day names
+        self._canvas_headers = [(create_rect(0, 0, 0, 0, width=0),
+                                 create_text(0, 0, font=self._font, text=''))]
+        firstweekday = self._properties['firstweekday']
+        for i in range(7):
+            self._canvas_headers.append((create_rect(0, 0, 0, 0, width=0),
+                                         create_text(0, 0, font=self._font,
+                                                     text=self._day_names[(firstweekday + i) % 7])))
+        self._canvas_week_nbs = []
+        self._canvas_cells = []
+        for i in range(6):
+            self._canvas_week_nbs.append((create_rect(0, 0, 0, 0, width=0),
+                                          create_text(0, 0, font=self._font,
+                                                      anchor='e', text='')))
+            self._canvas_cells.append([(create_rect(0, 0, 0, 0, width=0),
+                                        create_text(0, 0, font=self._font, text=''))
+                                       for j in range(7)])
+        self._canvas_xs = []  # column boundaries
+        self._canvas_ys = []  # row boundaries
+        self._canvas_update_size()
+        self._canvas_update_colors()
+        self._canvas.bind('<Configure>', self._canvas_layout)
+        self._canvas.bind('<1>', self._on_canvas_click)
+        self._canvas.bind('<Motion>', self._on_canvas_motion)
+
+    def _get_style_colors(self, style):
+        """Return the (background, foreground) colors of the day style key."""
+        if self._properties['state'] == 'disabled':
+            if style == 'sel':
+                bg, fg = 'disabledselectbackground', 'disabledselectforeground'
+            else:
+                bg, fg = 'disableddaybackground', 'disableddayforeground'
+        elif style in self._tag_styles:
+            tag = self._tags[self._tag_styles[style]]
+            return tag['background'], tag['foreground']
+        else:
+            bg, fg = self._style_colors[style]
+        return self._properties[bg], self._properties[fg]
+
+    def _canvas_update_size(self):
+        """Compute the canvas requested size from the font and layout the items."""
+        linespace = self._font.metrics('linespace')
+        col_width = max([self._font.measure('0000')] +
+                        [self._font.measure(name) for name in self._day_names.values()]) + 4
+        self._canvas_header_height = linespace + 2
+        self._canvas_row_height = linespace + 4
+        if self._properties['showweeknumbers']:
+            self._canvas_wn_width = self._font.measure('00') + 6
+            state = 'normal'
+        else:
+            self._canvas_wn_width = -1
+            state = 'hidden'
+        for items in [self._canvas_headers[0]] + self._canvas_week_nbs:
+            for item in items:
+                self._canvas.itemconfigure(item, state=state)
+        self._canvas.configure(width=self._canvas_wn_width + 1 + 7 * col_width,
+                               height=self._canvas_header_height + 1 + 6 * self._canvas_row_height)
+        self._canvas_layout()
+
+    def _canvas_layout(self, event=None):
+        """Place the canvas items so that they fill the canvas."""
+        width = self._canvas.winfo_width()
+        height = self._canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            # not displayed yet
+            width = self._canvas.winfo_reqwidth()
+            height = self._canvas.winfo_reqheight()
+        coords = self._canvas.coords
+        x0 = self._canvas_wn_width + 1
+        y0 = self._canvas_header_height + 1
+        col_width = (width - x0) / 7.
+        row_height = (height - y0) / 6.
+        xs = [x0 + int(round(i * col_width)) for i in range(8)]
+        ys = [y0 + int(round(i * row_height)) for i in range(7)]
+        self._canvas_xs = xs
+        self._canvas_ys = ys
+        wn_width = max(self._canvas_wn_width, 0)
+        rect, text = self._canvas_headers[0]
+        coords(rect, 0, 0, wn_width, y0 - 1)
+        for j in range(7):
+            rect, text = self._canvas_headers[j + 1]
+            coords(rect, xs[j], 0, xs[j + 1] - 1, y0 - 1)
+            coords(text, (xs[j] + xs[j + 1] - 1) // 2, y0 // 2)
+        for i in range(6):
+            ymid = (ys[i] + ys[i + 1] - 1) // 2
+            rect, text = self._canvas_week_nbs[i]
+            coords(rect, 0, ys[i], wn_width, ys[i + 1] - 1)
+            coords(text, wn_width - 2, ymid)
+            for j in range(7):
+                rect, text = self._canvas_cells[i][j]
+                coords(rect, xs[j], ys[i], xs[j + 1] - 1, ys[i + 1] - 1)
+                coords(text, (xs[j] + xs[j + 1] - 1) // 2, ymid)
+
+    def _canvas_update_colors(self):
+        """Update the colors of all the canvas items."""
+        itemconfigure = self._canvas.itemconfigure
+        self._canvas.configure(background=self._properties['bordercolor'])
+        bg, fg = self._get_style_colors('headers')
+        for rect, text in self._canvas_headers + self._canvas_week_nbs:
+            itemconfigure(rect, fill=bg)
+            itemconfigure(text, fill=fg)
+        for i in range(6):
+            for j in range(7):
+                bg, fg = self._get_style_colors(self._cells_shadow[i][j][1])
+                rect, text = self._canvas_cells[i][j]
+                itemconfigure(rect, fill=bg)
+                itemconfigure(text, fill=fg)
 
     def __getitem__(self, key):
         """Return the resource value for a KEY given as string."""
@@ -317,401 +1557,924 @@ class Calendar(ttk.Frame):
             raise AttributeError("Calendar object has no attribute %s." % key)
 
     def __setitem__(self, key, value):
-        if key not in self._properties:
-            raise AttributeError("Calendar object has no attribute %s." % key)
-        elif key is "locale":
-            raise AttributeError("This attribute cannot be modified.")
-        else:
-            if key is "selectmode":
-                if value is "none":
-                    for week in self._calendar:
-                        for day in week:
+        self.configure(**{key: value})
+
+    def _set_option(self, key, value):
+        """
+        Set the option key to value.
+
+        The styles and canvas colors are updated afterwards by configure.
+        """
+        if key is "selectmode":
+            self._check_selectmode(value)
+            if self._properties['engine'] == 'label':
+                for week in self._calendar:
+                    for day in week:
+                        if value == "none":
                             day.unbind("<1>")
-                elif value is "day":
-                    for week in self._calendar:
-                        for day in week:
+                        else:
                             day.bind("<1>", self._on_click)
-                else:
-                    raise ValueError("'selectmode' option should be 'none' or 'day'.")
-            elif key is 'textvariable':
-                if self._sel_date is not None:
-                    if value is not None:
-                        value.set(self.format_date(self._sel_date))
-                    try:
-                        if self._textvariable is not None:
-                            self._textvariable.trace_remove('write', self._textvariable_trace_id)
-                        if value is not None:
-                            self._textvariable_trace_id = value.trace_add('write', self._textvariable_trace)
-                    except AttributeError:
-                        if self._textvariable is not None:
-                            self._textvariable.trace_vdelete('w', self._textvariable_trace_id)
-                        if value is not None:
-                            value.trace('w', self._textvariable_trace)
-                self._textvariable = value
-            elif key is 'showweeknumbers':
-                if value:
-                    for wlabel in self._week_nbs:
-                        wlabel.grid()
-                else:
-                    for wlabel in self._week_nbs:
-                        wlabel.grid_remove()
-            elif key is 'borderwidth':
+                        if value == "range":
+                            day.bind("<Enter>", self._on_enter)
+                        else:
+                            day.unbind("<Enter>")
+            self._model.selectmode = value
+            self._range_anchor = self._range_hover = None
+            self._key_date = None
+            self._key_preview = False
+            self._invalidate('selection')
+        elif key is 'textvariable':
+            if self._sel_date is not None:
+                if value is not None:
+                    value.set(self.format_date(self._sel_date))
                 try:
-                    bd = int(value)
-                    self._cal_frame.pack_configure(padx=bd, pady=bd)
-                except ValueError:
-                    raise ValueError('expected integer for the borderwidth option.')
-            elif key is 'state':
-                if value not in ['normal', 'disabled']:
-                    raise ValueError("bad state '%s': must be disabled or normal" % value)
-                else:
-                    state = '!' * (value == 'normal') + 'disabled'
-                    self._l_year.state((state,))
-                    self._r_year.state((state,))
-                    self._l_month.state((state,))
-                    self._r_month.state((state,))
-                    for child in self._cal_frame.children.values():
-                        child.state((state,))
-            elif key is "font":
-                font = Font(self, value)
-                prop = font.actual()
-                self._font.configure(**prop)
-                prop["size"] += 1
-                self._header_font.configure(**prop)
-                size = max(prop["size"], 10)
-                self.style.configure('R.%s.TButton' % self._style_prefixe, arrowsize=size)
-                self.style.configure('L.%s.TButton' % self._style_prefixe, arrowsize=size)
-            elif key is "normalbackground":
-                self.style.configure('cal.%s.TFrame' % self._style_prefixe, background=value)
-                self.style.configure('normal.%s.TLabel' % self._style_prefixe, background=value)
-                self.style.configure('normal_om.%s.TLabel' % self._style_prefixe, background=value)
-            elif key is "normalforeground":
-                self.style.configure('normal.%s.TLabel' % self._style_prefixe, foreground=value)
-            elif key is "bordercolor":
-                self.style.configure('cal.%s.TFrame' % self._style_prefixe, background=value)
-            elif key is "othermonthforeground":
-                self.style.configure('normal_om.%s.TLabel' % self._style_prefixe, foreground=value)
-            elif key is "othermonthbackground":
-                self.style.configure('normal_om.%s.TLabel' % self._style_prefixe, background=value)
-            elif key is "othermonthweforeground":
-                self.style.configure('we_om.%s.TLabel' % self._style_prefixe, foreground=value)
-            elif key is "othermonthwebackground":
-                self.style.configure('we_om.%s.TLabel' % self._style_prefixe, background=value)
-            elif key is "selectbackground":
-                self.style.configure('sel.%s.TLabel' % self._style_prefixe, background=value)
-            elif key is "selectforeground":
-                self.style.configure('sel.%s.TLabel' % self._style_prefixe, foreground=value)
-            elif key is "disabledselectbackground":
-                self.style.map('sel.%s.TLabel' % self._style_prefixe, background=[('disabled', value)])
-            elif key is "disabledselectforeground":
-                self.style.map('sel.%s.TLabel' % self._style_prefixe, foreground=[('disabled', value)])
-            elif key is "disableddaybackground":
-                self.style.map('%s.TLabel' % self._style_prefixe, background=[('disabled', value)])
-            elif key is "disableddayforeground":
-                self.style.map('%s.TLabel' % self._style_prefixe, foreground=[('disabled', value)])
-            elif key is "weekendbackground":
-                self.style.configure('we.%s.TLabel' % self._style_prefixe, background=value)
-                self.style.configure('we_om.%s.TLabel' % self._style_prefixe, background=value)
-            elif key is "weekendforeground":
-                self.style.configure('we.%s.TLabel' % self._style_prefixe, foreground=value)
-            elif key is "headersbackground":
-                self.style.configure('headers.%s.TLabel' % self._style_prefixe, background=value)
-            elif key is "headersforeground":
-                self.style.configure('headers.%s.TLabel' % self._style_prefixe, foreground=value)
-            elif key is "background":
-                self.style.configure('main.%s.TFrame' % self._style_prefixe, background=value)
-                self.style.configure('main.%s.TLabel' % self._style_prefixe, background=value)
-                self.style.configure('R.%s.TButton' % self._style_prefixe, background=value,
-                                     bordercolor=value,
-                                     lightcolor=value, darkcolor=value)
-                self.style.configure('L.%s.TButton' % self._style_prefixe, background=value,
-                                     bordercolor=value,
-                                     lightcolor=value, darkcolor=value)
-            elif key is "foreground":
-                self.style.configure('R.%s.TButton' % self._style_prefixe, arrowcolor=value)
-                self.style.configure('L.%s.TButton' % self._style_prefixe, arrowcolor=value)
-                self.style.configure('main.%s.TLabel' % self._style_prefixe, foreground=value)
-            elif key is "cursor":
-                ttk.Frame.configure(self, cursor=value)
+                    if self._textvariable is not None:
+                        self._textvariable.trace_remove('write', self._textvariable_trace_id)
+                    if value is not None:
+                        self._textvariable_trace_id = value.trace_add('write', self._textvariable_trace)
+                except AttributeError:
+                    if self._textvariable is not None:
+                        self._textvariable.trace_vdelete('w', self._textvariable_trace_id)
+                    if value is not None:
+                        value.trace('w', self._textvariable_trace)
+            self._textvariable = value
+        elif key is 'showweeknumbers':
+            if self._properties['engine'] == 'canvas':
+                pass
+            elif value:
+                for wlabel in self._week_nbs:
+                    wlabel.grid()
+            else:
+                for wlabel in self._week_nbs:
+                    wlabel.grid_remove()
+        elif key is 'borderwidth':
+            bd = self._check_borderwidth(value)
+            if self._properties['engine'] == 'canvas':
+                self._canvas.pack_configure(padx=bd, pady=bd)
+            else:
+                self._cal_frame.pack_configure(padx=bd, pady=bd)
+        elif key is 'state':
+            self._check_state(value)
+            state = '!' * (value == 'normal') + 'disabled'
+            self._properties['state'] = value
+            self._update_arrows()
+            if self._properties['engine'] == 'label':
+                for child in self._cal_frame.children.values():
+                    child.state((state,))
+        elif key is "font":
+            font = Font(self, value)
+            prop = font.actual()
+            self._font.configure(**prop)
+            prop["size"] += 1
+            self._header_font.configure(**prop)
+        elif key is "cursor":
+            ttk.Frame.configure(self, cursor=value)
+        elif key == 'firstweekday':
+            value = self._check_firstweekday(value)
+            if value != self._properties['firstweekday']:
+                for i in range(7):
+                    name = self._day_names[(value + i) % 7]
+                    if self._properties['engine'] == 'canvas':
+                        self._canvas.itemconfigure(self._canvas_headers[i + 1][1], text=name)
+                    else:
+                        self._headers[i + 1].configure(text=name)
+                self._model.firstweekday = value
+                self._invalidate('grid')
+        elif key in ('mindate', 'maxdate', 'disableddays'):
+            # the values are checked by configure
             self._properties[key] = value
+            setattr(self._model, key, value)
+            self._see_date(self._model.clamp_month(self._date))
+            self.invalidate_disabled_days()
+            self._invalidate('header')
+        self._properties[key] = value
+
+    @staticmethod
+    def _check_selectmode(value):
+        """Check the value of the selectmode option."""
+        if value not in ("none", "day", "range", "multiple"):
+            raise ValueError("'selectmode' option should be 'none', 'day', 'range' or 'multiple'.")
+        return value
+
+    @staticmethod
+    def _check_borderwidth(value):
+        """Check the value of the borderwidth option and return it as an int."""
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError('expected integer for the borderwidth option.')
+
+    @staticmethod
+    def _check_state(value):
+        """Check the value of the state option."""
+        if value not in ['normal', 'disabled']:
+            raise ValueError("bad state '%s': must be disabled or normal" % value)
+        return value
+
+    @staticmethod
+    def _check_engine(value):
+        """Check the value of the engine option."""
+        if value not in ('label', 'canvas'):
+            raise ValueError("'engine' option should be 'label' or 'canvas'.")
+        return value
+
+    @staticmethod
+    def _check_firstweekday(value):
+        """Check the value of the firstweekday option."""
+        if value not in range(7):
+            raise ValueError("'firstweekday' option should be an integer between 0 (Monday) and 6 (Sunday).")
+        return int(value)
+
+    @classmethod
+    def _check_date_bound(cls, key, value):
+        """Check the value of the mindate/maxdate option and return it as a datetime.date."""
+        if value is None:
+            return None
+        if isinstance(value, cls.datetime):
+            return value.date()
+        if isinstance(value, cls.date):
+            return value
+        raise ValueError("'%s' option should be a datetime.date instance or None." % key)
+
+    @classmethod
+    def _check_date_bounds(cls, mindate, maxdate):
+        """Check the values of the mindate and maxdate options and return them as datetime.date."""
+        mindate = cls._check_date_bound('mindate', mindate)
+        maxdate = cls._check_date_bound('maxdate', maxdate)
+        if mindate is not None and maxdate is not None and mindate > maxdate:
+            raise ValueError("mindate should not be after maxdate.")
+        return mindate, maxdate
+
+    @staticmethod
+    def _check_disableddays(value):
+        """Check the value of the disableddays option."""
+        if value is not None and not callable(value):
+            raise ValueError("'disableddays' option should be a function or None.")
+        return value
+
+    def invalidate_disabled_days(self):
+        """
+        Clear the cached results of the disableddays function.
+
+        To be called when the days it disables change.
+        """
+        self._model.invalidate_disabled_days()
+        self._invalidate('grid')
+
+    def _update_arrows(self):
+        """Disable the arrows in disabled state and when the next/previous month is out of bounds."""
+        normal = self._properties['state'] == 'normal'
+        prev_ok, next_ok = self._model.get_navigation_state()
+        prev_ok, next_ok = normal and prev_ok, normal and next_ok
+        if (prev_ok, next_ok) != self._arrows_shadow:
+            self._arrows_shadow = (prev_ok, next_ok)
+            prev_state = ('!disabled',) if prev_ok else ('disabled',)
+            next_state = ('!disabled',) if next_ok else ('disabled',)
+            self._l_year.state(prev_state)
+            self._l_month.state(prev_state)
+            self._r_year.state(next_state)
+            self._r_month.state(next_state)
+
+    def _set_textvariable(self, value):
+        """Set the textvariable to value without parsing it back in the trace."""
+        self._writing_textvariable = True
+        try:
+            self._textvariable.set(value)
+        finally:
+            self._writing_textvariable = False
 
     def _textvariable_trace(self, *args):
+        if self._writing_textvariable:
+            return
         if self._properties.get("selectmode") is "day":
             date = self._textvariable.get()
             if not date:
-                self._remove_selection()
                 self._sel_date = None
+                self._invalidate('selection')
             else:
                 try:
                     self._sel_date = self.parse_date(date)
                 except Exception:
                     if self._sel_date is None:
-                        self._textvariable.set('')
+                        self._set_textvariable('')
                     else:
-                        self._textvariable.set(self.format_date(self._sel_date))
+                        self._set_textvariable(self.format_date(self._sel_date))
                     raise ValueError("%r is not a valid date." % date)
                 else:
-                    self._date = self._sel_date.replace(day=1)
-                    self._display_calendar()
-                    self._display_selection()
+                    self._see_date(self._sel_date)
+                    self._invalidate('selection')
 
-    def _setup_style(self, event=None):
-        """Configure style."""
-        self.style.layout('L.%s.TButton' % self._style_prefixe,
-                          [('Button.focus',
-                            {'children': [('Button.leftarrow', None)]})])
-        self.style.layout('R.%s.TButton' % self._style_prefixe,
-                          [('Button.focus',
-                            {'children': [('Button.rightarrow', None)]})])
-        active_bg = self.style.lookup('TEntry', 'selectbackground', ('focus',))
+    def _on_theme_change(self):
+        """Configure the styles for the new theme, called by the theme coordinator."""
+        self._setup_style()
+
+    def _setup_style(self, event=None, options=None):
+        """
+        Configure style.
 
-        sel_bg = self._properties.get('selectbackground')
-        sel_fg = self._properties.get('selectforeground')
-        dis_sel_bg = self._properties.get('disabledselectbackground')
-        dis_sel_fg = self._properties.get('disabledselectforeground')
-        dis_bg = self._properties.get('disableddaybackground')
-        dis_fg = self._properties.get('disableddayforeground')
-        cal_bg = self._properties.get('normalbackground')
-        cal_fg = self._properties.get('normalforeground')
-        hd_bg = self._properties.get("headersbackground")
-        hd_fg = self._properties.get("headersforeground")
-        bg = self._properties.get('background')
-        fg = self._properties.get('foreground')
-        bc = self._properties.get('bordercolor')
-        om_fg = self._properties.get('othermonthforeground')
-        om_bg = self._properties.get('othermonthbackground')
-        omwe_fg = self._properties.get('othermonthweforeground')
-        omwe_bg = self._properties.get('othermonthwebackground')
-        we_bg = self._properties.get('weekendbackground')
-        we_fg = self._properties.get('weekendforeground')
-
-        self.style.configure('main.%s.TFrame' % self._style_prefixe, background=bg)
-        self.style.configure('cal.%s.TFrame' % self._style_prefixe, background=bc)
-        self.style.configure('main.%s.TLabel' % self._style_prefixe, background=bg, foreground=fg)
-        self.style.configure('headers.%s.TLabel' % self._style_prefixe, background=hd_bg,
-                             foreground=hd_fg)
-        self.style.configure('normal.%s.TLabel' % self._style_prefixe, background=cal_bg,
-                             foreground=cal_fg)
-        self.style.configure('normal_om.%s.TLabel' % self._style_prefixe, background=om_bg,
-                             foreground=om_fg)
-        self.style.configure('we_om.%s.TLabel' % self._style_prefixe, background=omwe_bg,
-                             foreground=omwe_fg)
-        self.style.configure('sel.%s.TLabel' % self._style_prefixe, background=sel_bg,
-                             foreground=sel_fg)
-        self.style.configure('we.%s.TLabel' % self._style_prefixe, background=we_bg,
-                             foreground=we_fg)
+        The styles are shared by all the calendars with the same colors, so
+        they are only configured if the set of styles is new or if the theme
+        changed. options is the list of the options which changed, if the set
+        is not shared, only the styles depending on them are updated.
+        """
+        signature, theme = self._get_style_signature()
+        active_bg, size = signature[-1], signature[-2]
+        registry = self._style_registry
+        if options is not None and self._style_prefixe is not None:
+            if registry.rename(self._style_prefixe, signature, theme):
+                self._configure_style_set(self._style_prefixe, active_bg, size, options)
+                return
+            if registry.is_shared(self._style_prefixe):
+                # wait for the other calendars of the set: if they all change
+                # to the same options, the set is modified in place, see
+                # _move_style_sets
+                registry.request_move(self, options)
+                self._invalidate('style')
+                return
+        registry.cancel_move(self)
+        prefix, configure = registry.acquire(signature, theme)
+        if self._style_prefixe is not None:
+            self._style_registry.release(self._style_prefixe)
+        if configure:
+            self._configure_style_set(prefix, active_bg, size)
+        if (prefix, theme) != self._tag_styles_state:
+            self._configure_tag_styles(prefix)
+            self._tag_styles_state = (prefix, theme)
+        if prefix != self._style_prefixe:
+            old_prefix = self._style_prefixe
+            self._style_prefixe = prefix
+            if old_prefix is not None:
+                self._update_widget_styles()
+
+    def _get_style_signature(self):
+        """Return the signature of the style set of the calendar and the current theme."""
+        coordinator = self._theme_coordinator
+        active_bg = coordinator.cached(
+            'active_bg', lambda: self.style.lookup('TEntry', 'selectbackground', ('focus',)))
         size = max(self._header_font.actual()["size"], 10)
-        self.style.configure('R.%s.TButton' % self._style_prefixe, background=bg,
-                             arrowcolor=fg, arrowsize=size, bordercolor=bg,
-                             relief="flat", lightcolor=bg, darkcolor=bg)
-        self.style.configure('L.%s.TButton' % self._style_prefixe, background=bg,
-                             arrowsize=size, arrowcolor=fg, bordercolor=bg,
-                             relief="flat", lightcolor=bg, darkcolor=bg)
-
-        self.style.map('R.%s.TButton' % self._style_prefixe, background=[('active', active_bg)],
-                       bordercolor=[('active', active_bg)],
-                       relief=[('active', 'flat')],
-                       darkcolor=[('active', active_bg)],
-                       lightcolor=[('active', active_bg)])
-        self.style.map('L.%s.TButton' % self._style_prefixe, background=[('active', active_bg)],
-                       bordercolor=[('active', active_bg)],
-                       relief=[('active', 'flat')],
-                       darkcolor=[('active', active_bg)],
-                       lightcolor=[('active', active_bg)])
-        self.style.map('sel.%s.TLabel' % self._style_prefixe,
-                       background=[('disabled', dis_sel_bg)],
-                       foreground=[('disabled', dis_sel_fg)])
-        self.style.map(self._style_prefixe + '.TLabel',
-                       background=[('disabled', dis_bg)],
-                       foreground=[('disabled', dis_fg)])
+        signature = tuple(self._properties[key] for key in self._style_options) + (size, active_bg)
+        return signature, coordinator.cached('theme', self.style.theme_use)
 
-    def _display_calendar(self):
-        """Display the days of the current month (the one in self._date)."""
+    def _move_style_sets(self):
+        """
+        Apply the style changes of the calendars sharing a style set.
+
+        The moves of all the calendars of the Tk root are applied at once:
+        if all the calendars of a set change to the same options, the set is
+        modified in place and the widgets keep their styles, otherwise each
+        calendar gets the set matching its options.
+        """
+        groups = OrderedDict()  # {prefix: [(calendar, changed options)]}
+        for cal, options in self._style_registry.pop_moves().items():
+            groups.setdefault(cal._style_prefixe, []).append((cal, options))
+        for prefix, group in groups.items():
+            signatures = set()
+            for cal, options in group:
+                signature, theme = cal._get_style_signature()
+                signatures.add(signature)
+            if len(signatures) == 1 and self._style_registry.rename(prefix, signature, theme, len(group)):
+                options = []
+                for cal, changed in group:
+                    options.extend(option for option in changed if option not in options)
+                group[0][0]._configure_style_set(prefix, signature[-1], signature[-2], options)
+            else:
+                for cal, options in group:
+                    cal._setup_style()
+
+    def _configure_style_set(self, prefix, active_bg, size, options=None):
+        """
+        Configure the styles named with prefix from the current options.
+
+        If options is given, only the styles depending on them are updated.
+        The changes are merged so that each style is configured at most once.
+        """
+        changes = OrderedDict()  # {(method, style): {style option: value}}
+        if options is None:
+            options = self._style_options + ['font']
+            self.style.layout('L.%s.TButton' % prefix,
+                              [('Button.focus',
+                                {'children': [('Button.leftarrow', None)]})])
+            self.style.layout('R.%s.TButton' % prefix,
+                              [('Button.focus',
+                                {'children': [('Button.rightarrow', None)]})])
+            for button in ['L.%s.TButton', 'R.%s.TButton']:
+                changes['configure', button] = {'relief': 'flat'}
+                changes['map', button] = {'background': [('active', active_bg)],
+                                          'bordercolor': [('active', active_bg)],
+                                          'relief': [('active', 'flat')],
+                                          'darkcolor': [('active', active_bg)],
+                                          'lightcolor': [('active', active_bg)]}
+        for option in options:
+            value = size if option == 'font' else self._properties[option]
+            for method, style, name in self._style_table[option]:
+                kw = changes.setdefault((method, style), {})
+                kw[name] = value if method == 'configure' else [('disabled', value)]
+        for (method, style), kw in changes.items():
+            getattr(self.style, method)(style % prefix, **kw)
+
+    def _configure_tag_styles(self, prefix, tags=None):
+        """
+        Configure the styles of the calendar event tags (label engine).
+
+        They are named '<style key>.<prefix>.TLabel' so that they inherit the
+        disabled state colors of the style set.
+        """
+        if self._properties['engine'] == 'label':
+            if tags is None:
+                tags = self._tags
+            for tag in tags:
+                opts = self._tags[tag]
+                self.style.configure('%s.%s.TLabel' % (opts['style'], prefix),
+                                     background=opts['background'],
+                                     foreground=opts['foreground'])
+
+    def _update_widget_styles(self):
+        """Make the widgets use the styles named with the current prefix."""
+        prefix = self._style_prefixe
+        ttk.Frame.configure(self, style='main.%s.TFrame' % prefix)
+        for frame in self._header_frames:
+            frame.configure(style='main.%s.TFrame' % prefix)
+        self._header_month.configure(style='main.%s.TLabel' % prefix)
+        self._header_year.configure(style='main.%s.TLabel' % prefix)
+        self._l_month.configure(style='L.%s.TButton' % prefix)
+        self._l_year.configure(style='L.%s.TButton' % prefix)
+        self._r_month.configure(style='R.%s.TButton' % prefix)
+        self._r_year.configure(style='R.%s.TButton' % prefix)
+        if self._properties['engine'] == 'label':
+            self._cal_frame.configure(style='cal.%s.TFrame' % prefix)
+            for label in self._headers + self._week_nbs:
+                label.configure(style='headers.%s.TLabel' % prefix)
+            for i_week in range(6):
+                for i_day in range(7):
+                    style = self._cells_shadow[i_week][i_day][1]
+                    self._calendar[i_week][i_day].configure(style='%s.%s.TLabel' % (style, prefix))
+
+    def _set_cell(self, i_week, i_day, text=None, style=None):
+        """
+        Update the day label at (i_week, i_day) if its text or style changed.
+
+        style is the style key, e.g. 'normal' or 'we_om'.
+        Return True if the label was reconfigured.
+        """
+        old_text, old_style = self._cells_shadow[i_week][i_day]
+        if text is None:
+            text = old_text
+        if style is None:
+            style = old_style
+        if text == old_text and style == old_style:
+            return False
+        if self._properties['engine'] == 'canvas':
+            rect, item = self._canvas_cells[i_week][i_day]
+            bg, fg = self._get_style_colors(style)
+            self._canvas.itemconfigure(rect, fill=bg)
+            self._canvas.itemconfigure(item, text=text, fill=fg)
+        else:
+            self._calendar[i_week][i_day].configure(text=text,
+                                                    style='%s.%s.TLabel' % (style, self._style_prefixe))
+        self._cells_shadow[i_week][i_day] = (text, style)
+        return True
+
+    def _set_week_nb(self, i_week, text):
+        """Update the week number label of the row i_week if its text changed."""
+        if self._week_nbs_shadow[i_week] == text:
+            return False
+        if self._properties['engine'] == 'canvas':
+            self._canvas.itemconfigure(self._canvas_week_nbs[i_week][1], text=text)
+        else:
+            self._week_nbs[i_week].configure(text=text)
+        self._week_nbs_shadow[i_week] = text
+        return True
+
+    # --- display
+    def _invalidate(self, *parts):
+        """
+        Mark parts of the display as outdated.
+
+        parts are among 'header', 'grid' and 'selection'. They are redrawn
+        together at the next idle time, so that one action triggers at most
+        one redraw. The 'textvariable' part sets the textvariable to the
+        selected date at the same time and the 'style' part applies the
+        pending style changes of the calendars sharing a style set.
+        """
+        self._dirty.update(parts)
+        if self._render_after_id is None:
+            self._render_after_id = self.after_idle(self._render)
+
+    def _render(self):
+        self._render_after_id = None
+        self.update_display()
+
+    def update_display(self):
+        """Redraw now the outdated parts of the calendar instead of waiting for the next idle time."""
+        if self._render_after_id is not None:
+            self.after_cancel(self._render_after_id)
+            self._render_after_id = None
+        dirty = self._dirty
+        if not dirty:
+            return
+        self._dirty = set()
+        if 'style' in dirty:
+            self._move_style_sets()
+        if 'textvariable' in dirty and self._textvariable is not None:
+            self._set_textvariable('' if self._sel_date is None else self.format_date(self._sel_date))
+        if 'grid' in dirty:
+            # also redraws the header and the selection
+            self._display_calendar()
+        else:
+            if 'header' in dirty:
+                self._display_header()
+            if 'selection' in dirty:
+                self._display_selection()
+
+    def _see_date(self, date):
+        """Make the month of date the displayed one."""
+        if self._model.see(date):
+            self._invalidate('header', 'grid')
+
+    def _display_header(self):
+        """Display the current month and year in the header."""
+        self._update_arrows()
         year, month = self._date.year, self._date.month
+        header = self._month_names[month].title()
+        if self._header_shadow != (header, year):
+            self._header_month.configure(text=header)
+            self._header_year.configure(text=str(year))
+            self._header_shadow = (header, year)
 
-        # update header text (Month, Year)
-        header = self._month_names[month]
-        self._header_month.configure(text=header.title())
-        self._header_year.configure(text=str(year))
+    def _display_calendar(self):
+        """
+        Display the days of the current month (the one in self._date).
+
+        Only the labels whose text or style changed are reconfigured.
+        Return the number of updated day and week number labels.
+        """
+        self._display_header()
 
         # update calendar shown dates
-        cal = self._cal.monthdatescalendar(year, month)
-
-        next_m = month + 1
-        y = year
-        if next_m == 13:
-            next_m = 1
-            y += 1
-        if len(cal) < 6:
-            if cal[-1][-1].month == month:
-                i = 0
-            else:
-                i = 1
-            cal.append(self._cal.monthdatescalendar(y, next_m)[i])
-            if len(cal) < 6:
-                cal.append(self._cal.monthdatescalendar(y, next_m)[i + 1])
-
-        week_days = {i: 'normal' for i in range(7)}
-        week_days[5] = 'we'
-        week_days[6] = 'we'
-        prev_m = (month - 2) % 12 + 1
-        months = {month: '.%s.TLabel' % self._style_prefixe,
-                  next_m: '_om.%s.TLabel' % self._style_prefixe,
-                  prev_m: '_om.%s.TLabel' % self._style_prefixe}
-
-        week_nb = self._date.isocalendar()[1]
-        modulo = max(week_nb, 52)
+        view = self._model.get_view()
+        self._grid = grid = view.grid
+        self._disabled = view.disabled
+        updated = 0
         for i_week in range(6):
-            self._week_nbs[i_week].configure(text=str((week_nb + i_week - 1) % modulo + 1))
+            updated += self._set_week_nb(i_week, view.week_numbers[i_week])
+            styles = view.styles[i_week]
             for i_day in range(7):
-                style = week_days[i_day] + months[cal[i_week][i_day].month]
-                txt = str(cal[i_week][i_day].day)
-                self._calendar[i_week][i_day].configure(text=txt,
-                                                        style=style)
-        self._display_selection()
+                updated += self._set_cell(i_week, i_day, str(grid[i_week][i_day][0].day),
+                                          styles[i_day])
+        self._sel_cells = view.selection
+        return updated
 
     def _display_selection(self):
-        """Highlight selected day."""
-        if self._sel_date is not None:
-            year = self._sel_date.year
-            if year == self._date.year:
-                _, w, d = self._sel_date.isocalendar()
-                wn = self._date.isocalendar()[1]
-                w -= wn
-                w %= max(52, wn)
-                if 0 <= w and w < 6:
-                    self._calendar[w][d - 1].configure(style='sel.%s.TLabel' % self._style_prefixe)
+        """Update the highlight of the selected days, only restyling the cells that changed."""
+        sel = self._model.get_selection_cells(self._grid, self._disabled)
+        for w, d in self._sel_cells - sel:
+            self._set_cell(w, d, style=self._model.get_cell_style(self._grid[w][d], self._disabled))
+        for w, d in sel - self._sel_cells:
+            self._set_cell(w, d, style='sel')
+        self._sel_cells = sel
 
     def _remove_selection(self):
-        """Remove highlight of selected day."""
-        if self._sel_date is not None:
-            year, month = self._sel_date.year, self._sel_date.month
-            if year == self._date.year:
-                _, w, d = self._sel_date.isocalendar()
-                wn = self._date.isocalendar()[1]
-                w -= wn
-                w %= max(52, wn)
-                if w >= 0 and w < 6:
-                    if month == self._date.month:
-                        if d < 6:
-                            self._calendar[w][d - 1].configure(style='normal.%s.TLabel' % self._style_prefixe)
-                        else:
-                            self._calendar[w][d - 1].configure(style='we.%s.TLabel' % self._style_prefixe)
-                    else:
-                        if d < 6:
-                            self._calendar[w][d - 1].configure(style='normal_om.%s.TLabel' % self._style_prefixe)
-                        else:
-                            self._calendar[w][d - 1].configure(style='we_om.%s.TLabel' % self._style_prefixe)
+        """Remove highlight of selected days."""
+        for w, d in self._sel_cells:
+            self._set_cell(w, d, style=self._model.get_cell_style(self._grid[w][d], self._disabled))
+        self._sel_cells = set()
 
     # --- callbacks
     def _next_month(self):
         """Display the next month."""
-        year, month = self._date.year, self._date.month
-        self._date = self._date + \
-            self.timedelta(days=calendar.monthrange(year, month)[1])
-#        if month == 12:
-#            # don't increment year
-#            self._date = self._date.replace(year=year)
-        self._display_calendar()
+        if self._model.next_month():
+            self._invalidate('header', 'grid')
 
     def _prev_month(self):
         """Display the previous month."""
-        self._date = self._date - self.timedelta(days=1)
-        self._date = self._date.replace(day=1)
-        self._display_calendar()
+        if self._model.prev_month():
+            self._invalidate('header', 'grid')
 
     def _next_year(self):
-        """Display the next year."""
-        year = self._date.year
-        self._date = self._date.replace(year=year + 1)
-        self._display_calendar()
+        """Display the next year (or the last month within the bounds)."""
+        if self._model.next_year():
+            self._invalidate('header', 'grid')
 
     def _prev_year(self):
-        """Display the previous year."""
-        year = self._date.year
-        self._date = self._date.replace(year=year - 1)
-        self._display_calendar()
+        """Display the previous year (or the first month within the bounds)."""
+        if self._model.prev_year():
+            self._invalidate('header', 'grid')
 
     # --- bindings
     def _on_click(self, event):
         """Select the day on which the user clicked."""
-        if self._properties['state'] is 'normal':
-            label = event.widget
-            day = label.cget("text")
-            style = label.cget("style")
-            if style in ['normal_om.%s.TLabel' % self._style_prefixe, 'we_om.%s.TLabel' % self._style_prefixe]:
-                if label in self._calendar[0]:
-                    self._prev_month()
-                else:
-                    self._next_month()
-            if day:
-                day = int(day)
-                year, month = self._date.year, self._date.month
-                self._remove_selection()
-                self._sel_date = self.date(year, month, day)
-                self._display_selection()
-                if self._textvariable is not None:
-                    self._textvariable.set(self.format_date(self._sel_date))
-                self.event_generate("<<CalendarSelected>>")
+        if self._properties['state'] == 'normal' and self._properties['selectmode'] != 'none':
+            cell = self._label_cells.get(event.widget)
+            if cell is not None:
+                self.focus_set()
+                self.update_display()  # the clicked label must show the current grid
+                self._select_clicked_day(self._grid.days[7 * cell[0] + cell[1]])
+
+    def _on_canvas_click(self, event):
+        """Select the day on which the user clicked (canvas engine)."""
+        if self._properties['state'] == 'normal' and self._properties['selectmode'] != 'none':
+            i_week = bisect_right(self._canvas_ys, event.y) - 1
+            i_day = bisect_right(self._canvas_xs, event.x) - 1
+            if 0 <= i_week < 6 and 0 <= i_day < 7:
+                self.focus_set()
+                self.update_display()
+                self._select_clicked_day(self._grid.days[7 * i_week + i_day])
+
+    def _on_enter(self, event):
+        """Preview the range being selected when the pointer enters a day label."""
+        if self._range_anchor is not None and self._properties['state'] == 'normal':
+            cell = self._label_cells.get(event.widget)
+            if cell is not None:
+                self.update_display()
+                self._hover_day(self._grid.days[7 * cell[0] + cell[1]])
+
+    def _on_canvas_motion(self, event):
+        """Preview the range being selected when the pointer moves (canvas engine)."""
+        if self._range_anchor is not None and self._properties['state'] == 'normal':
+            i_week = bisect_right(self._canvas_ys, event.y) - 1
+            i_day = bisect_right(self._canvas_xs, event.x) - 1
+            if 0 <= i_week < 6 and 0 <= i_day < 7:
+                self.update_display()
+                self._hover_day(self._grid.days[7 * i_week + i_day])
+
+    def _hover_day(self, date):
+        """Extend the range preview to date."""
+        if date != self._range_hover:
+            self._range_hover = date
+            self._invalidate('selection')
+
+    def _key_move(self, days=0, months=0, edge=None):
+        """
+        Move the keyboard cursor by days or months, or to the first/last day of its month.
+
+        edge is 'home' or 'end'. In 'day' mode the cursor is the selection.
+        Only the dates change here, the display and the textvariable are
+        updated together at the next idle time, so that auto-repeated keys
+        do not queue one redraw each.
+        """
+        if self._properties['state'] != 'normal' or self._properties['selectmode'] == 'none':
+            return
+        target = self._model.get_key_target(days, months, edge)
+        if target is None:
+            return 'break'
+        if self._model.see(target):
+            self._invalidate('header', 'grid')
+        self._model.move_key(target)
+        if self._properties['selectmode'] == 'day':
+            self._invalidate('selection', 'textvariable')
+        else:
+            self._invalidate('selection')
+        return 'break'
+
+    def _on_return(self, event):
+        """Select the day of the keyboard cursor."""
+        if self._properties['state'] == 'normal' and self._properties['selectmode'] != 'none':
+            self.update_display()
+            date = self._model.get_key_date()
+            if date is not None:
+                self._select_clicked_day(date)
+            return 'break'
+
+    def _select_clicked_day(self, date):
+        """Select the clicked date, displaying its month if it belongs to the previous/next month."""
+        if date in self._disabled:
+            return
+        self._see_date(date)
+        selected = self._model.select(date)
+        self._invalidate('selection')
+        if selected:
+            if self._properties['selectmode'] == 'day' and self._textvariable is not None:
+                self._set_textvariable(self.format_date(self._sel_date))
+            self.event_generate("<<CalendarSelected>>")
 
     def format_date(self, date=None):
         """Convert date (datetime.date) to a string in the locale (short format)."""
-        return format_date(date, 'short', self._properties['locale'])
+        return self._locale_bundle.format_date(date)
 
     def parse_date(self, date):
         """Parse string date in the locale format and return the corresponding datetime.date."""
-        return parse_date(date, self._properties['locale'])
+        return self._locale_bundle.parse_date(date)
 
     # --- selection handling
+    def _to_date(self, date):
+        """Return date as a datetime.date, parse it if it is a string."""
+        if isinstance(date, self.datetime):
+            return date.date()
+        if isinstance(date, self.date):
+            return date
+        try:
+            return self.parse_date(date)
+        except Exception:
+            raise ValueError("%r is not a valid date." % date)
+
+    def _to_dates(self, dates):
+        """Return the set of the dates of the iterable dates (or of the single date dates)."""
+        if isinstance(dates, (self.date, _string_types)):
+            dates = [dates]
+        return set(self._to_date(date) for date in dates)
+
     def selection_get(self):
         """
         Return currently selected date (datetime.date instance).
-        Always return None if selectmode is "none".
-        """
 
-        if self._properties.get("selectmode") is "day":
+        If selectmode is "range", return the selected (start, end) dates and
+        if selectmode is "multiple", return the sorted tuple of the selected
+        dates. Always return None if selectmode is "none".
+        """
+        selectmode = self._properties.get("selectmode")
+        if selectmode == "day":
             return self._sel_date
+        elif selectmode == "range":
+            return self._sel_range
+        elif selectmode == "multiple":
+            return tuple(sorted(self._sel_dates))
         else:
             return None
 
+    def selection_add(self, dates):
+        """
+        Add dates to the selection if selectmode is "multiple".
+
+        dates is an iterable of datetime.date instances or of strings in the
+        Calendar locale format. The calendar is redrawn once and a single
+        <<CalendarSelected>> event is generated if the selection changed.
+        """
+        if self._properties['selectmode'] == 'multiple' and self._properties['state'] == 'normal':
+            dates = self._to_dates(dates)
+            if not dates <= self._sel_dates:
+                self._sel_dates |= dates
+                self._key_preview = False
+                self._invalidate('selection')
+                self.event_generate("<<CalendarSelected>>")
+
+    def selection_remove(self, dates):
+        """
+        Remove dates from the selection if selectmode is "multiple".
+
+        dates is an iterable of datetime.date instances or of strings in the
+        Calendar locale format. The calendar is redrawn once and a single
+        <<CalendarSelected>> event is generated if the selection changed.
+        """
+        if self._properties['selectmode'] == 'multiple' and self._properties['state'] == 'normal':
+            dates = self._to_dates(dates)
+            if not dates.isdisjoint(self._sel_dates):
+                self._sel_dates -= dates
+                self._key_preview = False
+                self._invalidate('selection')
+                self.event_generate("<<CalendarSelected>>")
+
+    def selection_clear(self):
+        """Clear the selection, a <<CalendarSelected>> event is generated if it was not empty."""
+        if self._properties['state'] != 'normal':
+            return
+        selectmode = self._properties['selectmode']
+        if selectmode == 'multiple' and self._sel_dates:
+            self._sel_dates.clear()
+        elif selectmode == 'range' and (self._sel_range is not None or
+                                        self._range_anchor is not None):
+            self._sel_range = None
+            self._range_anchor = self._range_hover = None
+        elif selectmode == 'day' and self._sel_date is not None:
+            self.selection_set(None)
+        else:
+            return
+        self._key_date = None
+        self._key_preview = False
+        self._invalidate('selection')
+        self.event_generate("<<CalendarSelected>>")
+
     def selection_set(self, date):
         """
         Set the selection to date.
 
         date can be either a datetime.date
         instance or a string corresponding to the date format "%x"
-        in the Calendar locale.
+        in the Calendar locale. If selectmode is "range", date is a
+        (start, end) pair of such dates and if selectmode is "multiple",
+        an iterable of such dates.
 
         Do nothing if selectmode is "none".
         """
-        if self._properties.get("selectmode") is "day" and self._properties['state'] is 'normal':
+        self._key_preview = False
+        if self._properties.get("selectmode") == "multiple" and self._properties['state'] == 'normal':
+            self._sel_dates = set() if date is None else self._to_dates(date)
+            self._invalidate('selection')
+        elif self._properties.get("selectmode") == "range" and self._properties['state'] == 'normal':
+            self._range_anchor = self._range_hover = None
+            self._key_date = None
+            if date is None:
+                self._sel_range = None
+            else:
+                start, end = date
+                self._sel_range = tuple(sorted((self._to_date(start), self._to_date(end))))
+                self._see_date(self._sel_range[0])
+            self._invalidate('selection')
+        elif self._properties.get("selectmode") is "day" and self._properties['state'] is 'normal':
             if date is None:
-                self._remove_selection()
                 self._sel_date = None
+                self._invalidate('selection')
                 if self._textvariable is not None:
-                    self._textvariable.set('')
+                    self._set_textvariable('')
             else:
-                if isinstance(date, self.date):
-                    self._sel_date = date
-                else:
-                    try:
-                        self._sel_date = self.parse_date(date)
-                    except Exception:
-                        raise ValueError("%r is not a valid date." % date)
+                self._sel_date = self._to_date(date)
                 if self._textvariable is not None:
-                    self._textvariable.set(self.format_date(self._sel_date))
-                self._date = self._sel_date.replace(day=1)
-                self._display_calendar()
-                self._display_selection()
+                    self._set_textvariable(self.format_date(self._sel_date))
+                self._see_date(self._sel_date)
+                self._invalidate('selection')
 
     def get_date(self):
-        """Return selected date as string."""
+        """
+        Return selected date as string.
+
+        If selectmode is "range", return the (start, end) pair of strings and
+        if selectmode is "multiple", the tuple of the selected dates strings.
+        """
+        if self._properties['selectmode'] == 'multiple':
+            return tuple(self.format_date(date) for date in sorted(self._sel_dates))
+        if self._properties['selectmode'] == 'range':
+            if self._sel_range is None:
+                return ""
+            return tuple(self.format_date(date) for date in self._sel_range)
         if self._sel_date is not None:
             return self.format_date(self._sel_date)
         else:
             return ""
 
+    # --- calendar events
+    def _calevent_changed(self, date):
+        """Redraw the calendar if date is displayed."""
+        if date in self._grid.index:
+            self._invalidate('grid')
+
+    def _add_tags(self, tags):
+        for tag in tags:
+            if tag not in self._tags:
+                self.tag_config(tag)
+
+    def calevent_create(self, date, text, tags=[]):
+        """
+        Add a new event to the calendar and return its id.
+
+        date: datetime.date instance
+        text: text describing the event
+        tags: tag or list of tags of the event, the days with events are
+              displayed with the style of the first tag of the last event,
+              see tag_config
+        """
+        if isinstance(date, self.datetime):
+            date = date.date()
+        elif not isinstance(date, self.date):
+            raise TypeError("date option should be a datetime.date instance.")
+        if isinstance(tags, _string_types):
+            tags = [tags]
+        else:
+            tags = list(tags)
+        self._add_tags(tags)
+        ev_id = self._calevent_count
+        self._calevent_count += 1
+        self._calevents[ev_id] = {'date': date, 'text': text, 'tags': tags}
+        try:
+            self._calevent_dates[date].append(ev_id)
+        except KeyError:
+            self._calevent_dates[date] = [ev_id]
+        self._calevent_changed(date)
+        return ev_id
+
+    def calevent_remove(self, *ev_ids, **kw):
+        """
+        Remove events from the calendar.
+
+        ev_ids: event ids, 'all' removes all the events
+        kw: date and/or tag, remove the events of this date/with this tag
+        """
+        if 'all' in ev_ids:
+            ev_ids = list(self._calevents)
+        elif kw:
+            ev_ids = set(ev_ids).union(self.get_calevents(**kw))
+        for ev_id in ev_ids:
+            try:
+                date = self._calevents.pop(ev_id)['date']
+            except KeyError:
+                raise ValueError("event %s does not exist." % ev_id)
+            day_ids = self._calevent_dates[date]
+            day_ids.remove(ev_id)
+            if not day_ids:
+                del self._calevent_dates[date]
+            self._calevent_changed(date)
+
+    def calevent_cget(self, ev_id, option):
+        """Return the value of the option ('date', 'text' or 'tags') of the event ev_id."""
+        try:
+            ev = self._calevents[ev_id]
+        except KeyError:
+            raise ValueError("event %s does not exist." % ev_id)
+        try:
+            value = ev[option]
+        except KeyError:
+            raise ValueError('unknown option "%s".' % option)
+        return list(value) if option == 'tags' else value
+
+    def calevent_configure(self, ev_id, **kw):
+        """Configure the options 'date', 'text' and/or 'tags' of the event ev_id."""
+        try:
+            ev = self._calevents[ev_id]
+        except KeyError:
+            raise ValueError("event %s does not exist." % ev_id)
+        for option in kw:
+            if option not in ev:
+                raise ValueError('unknown option "%s".' % option)
+        date = kw.get('date', ev['date'])
+        if isinstance(date, self.datetime):
+            date = date.date()
+        elif not isinstance(date, self.date):
+            raise TypeError("date option should be a datetime.date instance.")
+        if 'tags' in kw:
+            tags = kw['tags']
+            tags = [tags] if isinstance(tags, _string_types) else list(tags)
+            self._add_tags(tags)
+            ev['tags'] = tags
+        if 'text' in kw:
+            ev['text'] = kw['text']
+        if date != ev['date']:
+            self.calevent_remove(ev_id)
+            self._calevents[ev_id] = ev
+            self._calevent_dates.setdefault(date, []).append(ev_id)
+            ev['date'] = date
+        self._calevent_changed(date)
+
+    def get_calevents(self, date=None, tag=None):
+        """
+        Return the ids of the events of date and/or with tag.
+
+        If neither date nor tag is given, return all the event ids.
+        """
+        if date is not None:
+            ev_ids = self._calevent_dates.get(date, [])
+        else:
+            ev_ids = self._calevents
+        if tag is None:
+            return tuple(ev_ids)
+        return tuple(ev_id for ev_id in ev_ids if tag in self._calevents[ev_id]['tags'])
+
+    def tag_config(self, tag, **kw):
+        """
+        Configure the display of the days with events of tag.
+
+        Options: background, foreground (default: royal blue and white)
+        """
+        for option in kw:
+            if option not in ('background', 'foreground'):
+                raise ValueError('unknown option "%s".' % option)
+        opts = self._tags.get(tag)
+        if opts is None:
+            opts = {'background': 'royal blue', 'foreground': 'white',
+                    'style': 'tag%i' % next(_tag_style_ids)}
+            self._tags[tag] = opts
+            self._tag_styles[opts['style']] = tag
+        opts.update(kw)
+        self._configure_tag_styles(self._style_prefixe, [tag])
+        if self._properties['engine'] == 'canvas':
+            self._canvas_update_colors()
+
+    def tag_cget(self, tag, option):
+        """Return the value of the option ('background' or 'foreground') of tag."""
+        if option not in ('background', 'foreground'):
+            raise ValueError('unknown option "%s".' % option)
+        try:
+            return self._tags[tag][option]
+        except KeyError:
+            raise ValueError("tag %s does not exist." % tag)
+
+    def tag_delete(self, tag):
+        """Delete tag and remove it from all the events."""
+        try:
+            opts = self._tags.pop(tag)
+        except KeyError:
+            raise ValueError("tag %s does not exist." % tag)
+        del self._tag_styles[opts['style']]
+        for ev in self._calevents.values():
+            if tag in ev['tags']:
+                ev['tags'].remove(tag)
+                self._calevent_changed(ev['date'])
+        # redraw now so that no cell keeps the deleted style
+        self.update_display()
+
+    def tag_names(self):
+        """Return the tuple of the existing tags."""
+        return tuple(self._tags)
+
     # --- other methods
+    def destroy(self):
+        if self._render_after_id is not None:
+            self.after_cancel(self._render_after_id)
+            self._render_after_id = None
+        self._style_registry.cancel_move(self)
+        if self._style_prefixe is not None:
+            self._style_registry.release(self._style_prefixe)
+            self._style_prefixe = None
+        self._theme_coordinator.unregister(self)
+        ttk.Frame.destroy(self)
+
     def keys(self):
         """Return a list of all resource names of this widget."""
         return list(self._properties.keys())
@@ -728,8 +2491,30 @@ class Calendar(ttk.Frame):
         arguments. To get an overview about
         the allowed keyword arguments call the method keys.
         """
-        for item, value in kw.items():
-            self[item] = value
+        for key in kw:
+            if key not in self._properties:
+                raise AttributeError("Calendar object has no attribute %s." % key)
+            elif key in ("locale", "engine"):
+                raise AttributeError("This attribute cannot be modified.")
+        # check the new bounds together so that they can be moved past
+        # the current ones
+        if 'mindate' in kw or 'maxdate' in kw:
+            kw['mindate'], kw['maxdate'] = self._check_date_bounds(
+                kw.get('mindate', self._properties['mindate']),
+                kw.get('maxdate', self._properties['maxdate']))
+        if 'disableddays' in kw:
+            self._check_disableddays(kw['disableddays'])
+        for key, value in kw.items():
+            self._set_option(key, value)
+        # update all the styles at once
+        style_options = [key for key in kw if key == 'font' or key in self._style_options]
+        if style_options:
+            self._setup_style(options=style_options)
+        if self._properties['engine'] == 'canvas':
+            if 'font' in kw or 'showweeknumbers' in kw:
+                self._canvas_update_size()
+            if any(key in self._canvas_color_options for key in kw):
+                self._canvas_update_colors()
 
     def config(self, **kw):
         """
@@ -739,11 +2524,75 @@ class Calendar(ttk.Frame):
         arguments. To get an overview about
         the allowed keyword arguments call the method keys.
         """
-        for item, value in kw.items():
-            self[item] = value
+        self.configure(**kw)
+
 
+class _DropDown(object):
+    """
+    Drop-down calendar shared by the DateEntries of a toplevel window.
 
-class DateEntry(ttk.Entry):
+    The calendar is reconfigured with the options of the entry which opens it.
+    It is a child of the window so that it stays inside a grab set on it.
+    """
+
+    def __init__(self, master, locale, engine):
+        self.key = (str(master), locale, engine)
+        self.top = tk.Toplevel(master)
+        self.top.withdraw()
+        if platform == "linux":
+            self.top.attributes('-type', 'DROPDOWN_MENU')
+        self.top.overrideredirect(True)
+        self.calendar = Calendar(self.top, selectmode='day', locale=locale,
+                                 engine=engine)
+        self.calendar.pack()
+        self.defaults = self.calendar._properties.copy()
+        self.owner = None
+        # update entry content when date is selected in the Calendar
+        self.calendar.bind('<<CalendarSelected>>', self._on_select)
+        # hide calendar if it looses focus
+        self.calendar.bind('<FocusOut>', self._on_focus_out)
+        self.top.bind('<Destroy>', self._on_destroy)
+
+    def _on_destroy(self, event):
+        """Release the owner and forget the drop-down when its window is destroyed."""
+        if str(event.widget) != str(self.top):
+            return  # destruction of a child
+        self.owner = None
+        dropdowns = _get_root_registry(self.top, 'dropdowns', dict)
+        if dropdowns.get(self.key) is self:
+            del dropdowns[self.key]
+
+    def _on_select(self, event):
+        if self.owner is not None:
+            self.owner._select(event)
+
+    def _on_focus_out(self, event):
+        if self.owner is not None:
+            self.owner._on_focus_out_cal(event)
+
+    def bind_entry(self, entry):
+        """Configure the calendar with the options of entry and make it its owner."""
+        if self.owner is entry:
+            return
+        self.unbind_entry()
+        properties = self.calendar._properties
+        changes = {}
+        for key, default in self.defaults.items():
+            value = entry._calendar_kw.get(key, default)
+            if properties[key] != value:
+                changes[key] = value
+        self.calendar.configure(**changes)
+        self.owner = entry
+
+    def unbind_entry(self):
+        """Withdraw the calendar and release it from its current owner."""
+        if self.owner is not None:
+            self.top.withdraw()
+            self.owner.state(['!pressed'])
+            self.owner = None
+
+
+class DateEntry(_InstrumentationMixin, ttk.Entry):
     """Date selection entry with drop-down calendar."""
 
     entry_kw = {'exportselection': 1,
@@ -760,6 +2609,8 @@ class DateEntry(ttk.Entry):
                 'width': 12,
                 'xscrollcommand': ''}
 
+    _instrumented_methods = ('_setup_style', 'drop_down', 'format_date', 'parse_date')
+
     def __init__(self, master=None, **kw):
         """
         Create an entry with a drop-down calendar to select a date.
@@ -777,7 +2628,6 @@ class DateEntry(ttk.Entry):
             the user selects a date.
         """
         # sort keywords between entry options and calendar options
-        kw['selectmode'] = 'day'
         entry_kw = {}
 
         for key in self.entry_kw:
@@ -786,23 +2636,43 @@ class DateEntry(ttk.Entry):
 
         ttk.Entry.__init__(self, master, **entry_kw)
 
-        self._determine_downarrow_name_after_id = ''
-
-        # drop-down calendar
-        self._top_cal = tk.Toplevel(self)
-        self._top_cal.withdraw()
-        if platform == "linux":
-            self._top_cal.attributes('-type', 'DROPDOWN_MENU')
-        self._top_cal.overrideredirect(True)
-        self._calendar = Calendar(self._top_cal, **kw)
-        self._calendar.pack()
+        # downarrow button bbox (x0, y0, x1, y1), computed at the first mouse
+        # event after <Configure> and theme change so that mouse motions are
+        # handled without Tk calls
+        self._downarrow_bbox = None
+        self._over_downarrow = False
+        # last (text, date) pair written or parsed, to avoid parsing the
+        # entry content again while it is unchanged
+        self._parsed_text = (None, None)
 
-        # locale date parsing / formatting
-        self.format_date = self._calendar.format_date
-        self.parse_date = self._calendar.parse_date
+        # initially selected date
+        today = Calendar.date.today()
+        year = kw.pop('year', today.year)
+        month = kw.pop('month', today.month)
+        day = kw.pop('day', today.day)
+        try:
+            self._date = Calendar.date(year, month, day)
+        except ValueError:
+            self._date = today
+
+        # options of the drop-down calendar, it is shared with the other
+        # DateEntries and only created when dropped down
+        self._calendar_kw = {key: kw[key] for key in kw if key in Calendar._options}
+        self._check_calendar_kw(self._calendar_kw)
+        self._calendar_kw['selectmode'] = 'day'
+        self._calendar_kw.setdefault('locale', _get_default_locale())
+        self._calendar_kw.setdefault('engine', 'label')
+        self._locale_bundle = _get_locale_bundle(self._calendar_kw['locale'])
+        mindate, maxdate = self._get_date_bounds()
+        if mindate is not None and self._date < mindate:
+            self._date = mindate
+        elif maxdate is not None and self._date > maxdate:
+            self._date = maxdate
 
         # style
         self.style = ttk.Style(self)
+        self._theme_coordinator = _get_theme_coordinator(self)
+        self._theme_coordinator.register(self)
         self._setup_style()
         self.configure(style='DateEntry')
 
@@ -812,81 +2682,157 @@ class DateEntry(ttk.Entry):
         self.configure(validate='focusout',
                        validatecommand=validatecmd)
 
-        # initially selected date
-        self._date = self._calendar.selection_get()
-        if self._date is None:
-            today = self._calendar.date.today()
-            year = kw.get('year', today.year)
-            month = kw.get('month', today.month)
-            day = kw.get('day', today.day)
-            try:
-                self._date = self._calendar.date(year, month, day)
-            except ValueError:
-                self._date = today
-        self._set_text(self.format_date(self._date))
-
-        self._theme_change = True
+        self._set_text(self.format_date(self._date), self._date)
 
         # --- bindings
-        # reconfigure style if theme changed
-        self.bind('<<ThemeChanged>>',
-                  lambda e: self.after(10, self._on_theme_change))
-        # determine new downarrow button bbox
-        self.bind('<Configure>', self._determine_downarrow_name)
-        self.bind('<Map>', self._determine_downarrow_name)
+        # the downarrow button bbox is computed again at the next mouse event
+        self.bind('<Configure>', self._reset_downarrow_bbox)
+        self.bind('<Map>', self._reset_downarrow_bbox)
         # handle appearence to make the entry behave like a Combobox but with
         # a drop-down calendar instead of a drop-down list
-        self.bind('<Leave>', lambda e: self.state(['!active']))
+        self.bind('<Leave>', self._on_leave)
         self.bind('<Motion>', self._on_motion)
         self.bind('<ButtonPress-1>', self._on_b1_press)
-        # update entry content when date is selected in the Calendar
-        self._calendar.bind('<<CalendarSelected>>', self._select)
-        # hide calendar if it looses focus
-        self._calendar.bind('<FocusOut>', self._on_focus_out_cal)
 
     def __getitem__(self, key):
         """Return the resource value for a KEY given as string."""
         return self.cget(key)
 
+    def _get_dropdown(self):
+        """
+        Return the drop-down calendar of the entry.
+
+        It is shared by the DateEntries of the same toplevel window with the
+        same locale and engine.
+        """
+        dropdown = self._find_dropdown()
+        if dropdown is None:
+            dropdown = _DropDown(self.winfo_toplevel(), self._calendar_kw['locale'],
+                                 self._calendar_kw['engine'])
+            _get_root_registry(self, 'dropdowns', dict)[dropdown.key] = dropdown
+        return dropdown
+
+    def _find_dropdown(self):
+        """Return the drop-down calendar of the entry if it is already created, None otherwise."""
+        dropdowns = _get_root_registry(self, 'dropdowns', dict)
+        return dropdowns.get((str(self.winfo_toplevel()), self._calendar_kw['locale'],
+                              self._calendar_kw['engine']))
+
+    @property
+    def _calendar(self):
+        """Drop-down calendar, configured for this entry."""
+        dropdown = self._get_dropdown()
+        dropdown.bind_entry(self)
+        return dropdown.calendar
+
+    @property
+    def _top_cal(self):
+        """Toplevel of the drop-down calendar, configured for this entry."""
+        dropdown = self._get_dropdown()
+        dropdown.bind_entry(self)
+        return dropdown.top
+
+    def format_date(self, date=None):
+        """Convert date (datetime.date) to a string in the locale (short format)."""
+        return self._locale_bundle.format_date(date)
+
+    def parse_date(self, date):
+        """Parse string date in the locale format and return the corresponding datetime.date."""
+        return self._locale_bundle.parse_date(date)
+
     def __setitem__(self, key, value):
         self.configure(**{key: value})
 
     def _setup_style(self, event=None):
         """Style configuration."""
+        self._theme_coordinator.cached('DateEntry', self._configure_style)
+        self._reset_downarrow_bbox()
+
+    def _configure_style(self):
+        """Configure the DateEntry style, shared by all the DateEntries, from the Combobox one."""
         self.style.layout('DateEntry', self.style.layout('TCombobox'))
         fieldbg = self.style.map('TCombobox', 'fieldbackground')
-        self.update_idletasks()
-
         self.style.map('DateEntry', fieldbackground=fieldbg)
-        try:
-            self.after_cancel(self._determine_downarrow_name_after_id)
-        except ValueError:
-            # nothing to cancel
-            pass
-        self._determine_downarrow_name_after_id = self.after(10, self._determine_downarrow_name)
 
-    def _determine_downarrow_name(self, event=None):
-        """Determine downarrow button bbox."""
+    def _reset_downarrow_bbox(self, event=None):
+        """Discard the downarrow button bbox after a geometry or theme change."""
+        self._downarrow_bbox = None
+
+    def _get_downarrow_name(self):
+        """
+        Return the name of the downarrow element in the layout of the entry style.
+
+        The name is looked up once per style and theme and shared by all the
+        DateEntries of the Tk root. Return None if the layout has no downarrow.
+        """
+        names = _get_root_registry(self, 'downarrow_names', dict)
+        key = (str(self.cget('style')) or 'TEntry', self.style.theme_use())
         try:
-            self.after_cancel(self._determine_downarrow_name_after_id)
-        except ValueError:
-            # nothing to cancel
-            pass
-        if self.winfo_ismapped():
-            self.update_idletasks()
-            y = self.winfo_height() // 2
+            return names[key]
+        except KeyError:
+            name = names[key] = _find_layout_element(self.style.layout(key[0]), 'downarrow')
+            return name
+
+    def _get_downarrow_bbox(self):
+        """
+        Return the downarrow button bbox (x0, y0, x1, y1).
+
+        The result is cached until the next <Configure> or theme change.
+        Return an empty tuple if the widget is not mapped or has no downarrow.
+        """
+        if self._downarrow_bbox is not None:
+            return self._downarrow_bbox
+        if not self.winfo_ismapped():
+            return ()
+        bbox = ()
+        name = self._get_downarrow_name()
+        if name is not None:
             x = self.winfo_width() - 10
-            name = self.identify(x, y)
-            if name:
-                self._downarrow_name = name
-            else:
-                self._determine_downarrow_name_after_id = self.after(10, self._determine_downarrow_name)
+            y = self.winfo_height() // 2
+            element = self.identify(x, y)
+            if not element:
+                # the widget is not laid out yet
+                return ()
+            # depending on the Tk version, identify gives the element name
+            # with or without the widget class prefix
+            if element.split('.')[-1] == name.split('.')[-1]:
+                bbox = self._get_element_bbox(x, y)
+        self._downarrow_bbox = bbox
+        return bbox
+
+    def _get_element_bbox(self, x, y):
+        """Return the bbox (x0, y0, x1, y1) of the element of the layout at (x, y)."""
+        name = self.identify(x, y)
+
+        def edge(inside, outside, identify):
+            # bisect between a coordinate inside the element and one outside
+            while abs(outside - inside) > 1:
+                middle = (inside + outside) // 2
+                if identify(middle) == name:
+                    inside = middle
+                else:
+                    outside = middle
+            return inside
+
+        x0 = edge(x, -1, lambda i: self.identify(i, y))
+        x1 = edge(x, self.winfo_width(), lambda i: self.identify(i, y)) + 1
+        y0 = edge(y, -1, lambda j: self.identify(x, j))
+        y1 = edge(y, self.winfo_height(), lambda j: self.identify(x, j)) + 1
+        return x0, y0, x1, y1
+
+    def _is_on_downarrow(self, x, y):
+        """Return True if (x, y) is in the downarrow button."""
+        bbox = self._get_downarrow_bbox()
+        return bool(bbox) and bbox[0] <= x < bbox[2] and bbox[1] <= y < bbox[3]
 
     def _on_motion(self, event):
         """Set widget state depending on mouse position to mimic Combobox behavior."""
-        x, y = event.x, event.y
+        over = self._is_on_downarrow(event.x, event.y)
+        if over == self._over_downarrow:
+            return
+        self._over_downarrow = over
         if 'disabled' not in self.state():
-            if self.identify(x, y) == self._downarrow_name:
+            if over:
                 self.state(['active'])
                 self.configure(cursor='arrow')
             else:
@@ -894,19 +2840,18 @@ class DateEntry(ttk.Entry):
                 if 'readonly' not in self.state():
                     self.configure(cursor='xterm')
 
-    def _on_theme_change(self):
-        if self._theme_change:
-            self._theme_change = False
-            self._setup_style()
-            self.after(50, self._set_theme_change)
+    def _on_leave(self, event):
+        self._over_downarrow = False
+        self.state(['!active'])
 
-    def _set_theme_change(self):
-        self._theme_change = True
+    def _on_theme_change(self):
+        """Configure the style for the new theme, called by the theme coordinator."""
+        self._setup_style()
 
     def _on_b1_press(self, event):
         """Trigger self.drop_down on downarrow button press and set widget state to ['pressed', 'active']."""
         x, y = event.x, event.y
-        if (('disabled' not in self.state()) and self.identify(x, y) == self._downarrow_name):
+        if 'disabled' not in self.state() and self._is_on_downarrow(x, y):
             self.state(['pressed'])
             self.drop_down()
 
@@ -915,7 +2860,7 @@ class DateEntry(ttk.Entry):
         if self.focus_get() is not None:
             if self.focus_get() == self:
                 x, y = event.x, event.y
-                if (type(x) != int or type(y) != int or self.identify(x, y) != self._downarrow_name):
+                if type(x) != int or type(y) != int or not self._is_on_downarrow(x, y):
                     self._top_cal.withdraw()
                     self.state(['!pressed'])
             else:
@@ -934,27 +2879,86 @@ class DateEntry(ttk.Entry):
                 self._top_cal.withdraw()
                 self.state(['!pressed'])
 
+    def _check_calendar_kw(self, kw):
+        """
+        Check kw, the new values of drop-down calendar options.
+
+        The drop-down calendar is only created when it is first dropped
+        down so the options are checked here to raise the errors early.
+        The date bounds are checked together with the current ones and are
+        converted to datetime.date in place.
+        """
+        if kw.get('selectmode', 'day') not in ('day', 'none'):
+            # the entry displays a single date
+            raise ValueError("'selectmode' option should be 'day' or 'none'.")
+        for key, check in (('borderwidth', Calendar._check_borderwidth),
+                           ('engine', Calendar._check_engine)):
+            if key in kw:
+                check(kw[key])
+        if kw.get('firstweekday') is not None:
+            Calendar._check_firstweekday(kw['firstweekday'])
+        if 'mindate' in kw or 'maxdate' in kw:
+            kw['mindate'], kw['maxdate'] = Calendar._check_date_bounds(
+                kw.get('mindate', self._calendar_kw.get('mindate')),
+                kw.get('maxdate', self._calendar_kw.get('maxdate')))
+        if 'disableddays' in kw:
+            Calendar._check_disableddays(kw['disableddays'])
+
+    def _get_date_bounds(self):
+        """Return the (mindate, maxdate) of the drop-down calendar as datetime.date or None."""
+        return self._calendar_kw.get('mindate'), self._calendar_kw.get('maxdate')
+
+    def _is_disabled(self, date):
+        """Return True if date is disabled in the drop-down calendar."""
+        mindate, maxdate = self._get_date_bounds()
+        return _is_disabled_day(date, mindate, maxdate, self._calendar_kw.get('disableddays'))
+
+    def _parse_text(self):
+        """
+        Return the entry content as a datetime.date.
+
+        The content is only parsed if it changed since the last call or
+        the last _set_text. Raise ValueError or IndexError if it is not
+        a valid date.
+        """
+        txt = self.get()
+        if txt != self._parsed_text[0]:
+            self._parsed_text = (txt, self.parse_date(txt))
+        return self._parsed_text[1]
+
     def _validate_date(self):
-        """Date entry validation: only dates in locale '%x' format are accepted."""
+        """
+        Date entry validation.
+
+        Only dates in locale '%x' format which are not disabled are accepted.
+        """
         try:
-            self._date = self.parse_date(self.get())
-            return True
+            date = self._parse_text()
         except (ValueError, IndexError):
-            self._set_text(self.format_date(self._date))
+            date = None
+        if date is None or self._is_disabled(date):
+            self._set_text(self.format_date(self._date), self._date)
             return False
+        self._date = date
+        return True
 
     def _select(self, event=None):
         """Display the selected date in the entry and hide the calendar."""
         date = self._calendar.selection_get()
         if date is not None:
-            self._set_text(self.format_date(date))
+            self._set_text(self.format_date(date), date)
             self.event_generate('<<DateEntrySelected>>')
         self._top_cal.withdraw()
         if 'readonly' not in self.state():
             self.focus_set()
 
-    def _set_text(self, txt):
-        """Insert text in the entry."""
+    def _set_text(self, txt, date=None):
+        """
+        Insert text in the entry.
+
+        If date is not None, it is the datetime.date corresponding to txt
+        and get_date will return it without parsing txt.
+        """
         if 'readonly' in self.state():
             readonly = True
             self.state(('!readonly',))
@@ -964,28 +2968,31 @@ class DateEntry(ttk.Entry):
         self.insert(0, txt)
         if readonly:
             self.state(('readonly',))
+        if date is not None:
+            self._parsed_text = (self.get(), date)
 
     def destroy(self):
-        try:
-            self.after_cancel(self._determine_downarrow_name_after_id)
-        except ValueError:
-            # nothing to cancel
-            pass
+        self._theme_coordinator.unregister(self)
+        dropdown = self._find_dropdown()
+        if dropdown is not None and dropdown.owner is self:
+            dropdown.unbind_entry()
         ttk.Entry.destroy(self)
 
     def drop_down(self):
         """Display or withdraw the drop-down calendar depending on its current state."""
-        if self._calendar.winfo_ismapped():
-            self._top_cal.withdraw()
+        dropdown = self._get_dropdown()
+        if dropdown.owner is self and dropdown.calendar.winfo_ismapped():
+            dropdown.top.withdraw()
         else:
             self._validate_date()
-            date = self.parse_date(self.get())
+            date = self._date
+            dropdown.bind_entry(self)
             x = self.winfo_rootx()
             y = self.winfo_rooty() + self.winfo_height()
-            self._top_cal.geometry('+%i+%i' % (x, y))
-            self._top_cal.deiconify()
-            self._calendar.focus_set()
-            self._calendar.selection_set(date)
+            dropdown.top.geometry('+%i+%i' % (x, y))
+            dropdown.top.deiconify()
+            dropdown.calendar.focus_set()
+            dropdown.calendar.selection_set(date)
 
     def state(self, *args):
         """
@@ -1008,15 +3015,19 @@ class DateEntry(ttk.Entry):
     def keys(self):
         """Return a list of all resource names of this widget."""
         keys = list(self.entry_kw)
-        keys.extend(self._calendar.keys())
+        keys.extend(Calendar._options)
         return list(set(keys))
 
     def cget(self, key):
         """Return the resource value for a KEY given as string."""
         if key in self.entry_kw:
             return ttk.Entry.cget(self, key)
+        elif key in self._calendar_kw:
+            return self._calendar_kw[key]
+        elif key in Calendar._options:
+            return self._get_dropdown().defaults[key]
         else:
-            return self._calendar.cget(key)
+            raise AttributeError("Calendar object has no attribute %s." % key)
 
     def configure(self, **kw):
         """
@@ -1034,8 +3045,22 @@ class DateEntry(ttk.Entry):
         font = kw.get('font', None)
         if font is not None:
             entry_kw['font'] = font
+        for key in kw:
+            if key not in Calendar._options:
+                raise AttributeError("Calendar object has no attribute %s." % key)
+            elif key in ("locale", "engine"):
+                raise AttributeError("This attribute cannot be modified.")
+        self._check_calendar_kw(kw)
         ttk.Entry.configure(self, **entry_kw)
-        self._calendar.configure(**kw)
+        if 'style' in entry_kw:
+            self._reset_downarrow_bbox()
+        if kw:
+            # the drop-down calendar is only reconfigured if this entry
+            # owns it, otherwise it is when the entry is next dropped down
+            dropdown = self._find_dropdown()
+            if dropdown is not None and dropdown.owner is self:
+                dropdown.calendar.configure(**kw)
+            self._calendar_kw.update(kw)
 
     def config(self, **kw):
         """
@@ -1059,15 +3084,18 @@ class DateEntry(ttk.Entry):
         except AssertionError:
             txt = str(date)
             try:
-                self.parse_date(txt)
+                date = self.parse_date(txt)
             except Exception:
                 raise ValueError("%r is not a valid date." % date)
-        self._set_text(txt)
+        else:
+            if isinstance(date, Calendar.datetime):
+                date = date.date()
+        self._set_text(txt, date)
 
     def get_date(self):
         """Return the content of the DateEntry as a datetime.date instance."""
         self._validate_date()
-        return self.parse_date(self.get())
+        return self._date
 
 
 if __name__ == "__main__":